@@ -0,0 +1,64 @@
+"""
+Configure Django with an in-memory SQLite database and synthetic models
+"""
+import django
+from django.conf import settings
+
+# status choices of synthetic items
+STATUS_CHOICES = [('draft', 'Draft'), ('published', 'Published'), ('archived', 'Archived')]
+
+
+def setup(width=10):
+    if not settings.configured:
+        settings.configure(
+            DEBUG=False,
+            INSTALLED_APPS=['django.contrib.contenttypes', 'graphene_django', 'benchmarks'],
+            DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        )
+        django.setup()
+
+    return build_models(width)
+
+
+def build_models(width):
+    from django.db import connection, models
+
+    category = type('Category', (models.Model,), {
+        '__module__': 'benchmarks.models',
+        'name': models.CharField(max_length=50),
+    })
+
+    attrs = {
+        '__module__': 'benchmarks.models',
+        'rank': models.IntegerField(db_index=True),
+        'status': models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft'),
+        'category': models.ForeignKey(category, on_delete=models.CASCADE, related_name='items'),
+    }
+
+    for index in range(width):
+        # the configurable width of the model
+        attrs['field_%d' % index] = models.CharField(max_length=100, default='')
+
+    item = type('Item', (models.Model,), attrs)
+
+    with connection.schema_editor() as editor:
+        editor.create_model(category)
+        editor.create_model(item)
+
+    return category, item
+
+
+def populate(category_model, item_model, rows, width):
+    # sqlite doesn't return primary keys from bulk inserts
+    categories = [category_model.objects.create(name='category %d' % index) for index in range(10)]
+
+    item_model.objects.bulk_create([
+        item_model(
+            rank=index,
+            status=STATUS_CHOICES[index % len(STATUS_CHOICES)][0],
+            category=categories[index % len(categories)],
+            **{'field_%d' % field: 'value %d %d' % (index, field) for field in range(width)}
+        )
+        for index in range(rows)
+    ], batch_size=500)
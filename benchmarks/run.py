@@ -0,0 +1,239 @@
+"""
+Run the benchmark suite and report results as JSON
+
+    python -m benchmarks.run --rows 10000 --width 20 --output results.json
+
+Results may be compared across commits with any JSON diff tool.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from . import bootstrap, startup
+
+
+def measure(func, repeat):
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'runs': repeat,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'max': max(timings),
+    }
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+"""
+Benchmark cases
+"""
+
+
+def pager_cases(item_model, rows):
+    from django_graphene_utils import Pager
+
+    class ItemPager(Pager):
+        RANK = 'rank'
+
+    class ItemKeysetPager(Pager):
+        RANK = 'rank'
+
+        class Meta:
+            keyset = True
+
+    # querysets cache their results, always start from a fresh one
+    queryset = item_model.objects.all
+    deep_offset = max(rows - 20, 0)
+    # the cursor of the last item before the deep page
+    cursor_pager = ItemKeysetPager({'sort': ['rank'], 'offset': max(deep_offset - 1, 0), 'size': 1}, queryset())
+    deep_cursor = cursor_pager.end_cursor
+
+    return {
+        'pager_shallow': lambda: list(ItemPager({'sort': ['rank'], 'offset': 0, 'size': 20}, queryset()).qs),
+        'pager_deep': lambda: list(ItemPager({'sort': ['rank'], 'offset': deep_offset, 'size': 20}, queryset()).qs),
+        'pager_keyset_deep': lambda: list(ItemKeysetPager({'sort': ['rank'], 'after': deep_cursor, 'size': 20},
+                                                          queryset()).qs),
+        'pager_all': lambda: list(ItemPager({'all': True}, queryset()).qs),
+    }
+
+
+def mutation_cases(item_model, width):
+    import graphene
+    from django import forms
+    from graphene_django import DjangoObjectType
+    from django_graphene_utils import ModelFormMutation, ReduceMixin, ReduceMixinForm, convert_form
+
+    class ItemType(DjangoObjectType):
+        class Meta:
+            model = item_model
+
+    class ItemForm(ReduceMixinForm, forms.ModelForm):
+        cache_reduced_classes = True
+
+        class Meta:
+            model = item_model
+            fields = ['rank', 'status', 'category'] + ['field_%d' % index for index in range(width)]
+
+    item_input = convert_form(ItemForm, name='ItemInput', all_optional=True)
+
+    class CreateItem(ModelFormMutation):
+        class Input:
+            data = graphene.Argument(item_input, required=True)
+
+        class Meta:
+            form = ItemForm
+
+    class UpdateItem(ModelFormMutation):
+        class Input:
+            id = graphene.ID(required=True)
+            data = graphene.Argument(item_input, required=True)
+
+        class Meta:
+            form = ItemForm
+            filter = {'pk': 'id'}
+
+    class ReduceItem(ReduceMixin, ModelFormMutation):
+        class Input:
+            id = graphene.ID(required=True)
+            data = graphene.Argument(item_input, required=True)
+
+        class Meta:
+            form = ItemForm
+            filter = {'pk': 'id'}
+
+    class Query(graphene.ObjectType):
+        item = graphene.Field(ItemType)
+
+    class Mutation(graphene.ObjectType):
+        create_item = CreateItem.as_mutation().Field()
+        update_item = UpdateItem.as_mutation().Field()
+        reduce_item = ReduceItem.as_mutation().Field()
+
+    schema = graphene.Schema(query=Query, mutation=Mutation)
+    instance = item_model.objects.first()
+    # graphql names are camel cased
+    full_data = dict(
+        rank=1, status='draft', category=str(instance.category_id),
+        **{'field%d' % index: 'updated' for index in range(width)}
+    )
+
+    def run(query, variables):
+        result = schema.execute(query, variable_values=variables)
+
+        if result.errors:
+            raise result.errors[0]
+
+    create = 'mutation($data: ItemInput!) { createItem(data: $data) { success } }'
+    update = 'mutation($id: ID!, $data: ItemInput!) { updateItem(id: $id, data: $data) { success } }'
+    reduce = 'mutation($id: ID!, $data: ItemInput!) { reduceItem(id: $id, data: $data) { success } }'
+
+    return {
+        'mutation_create': lambda: run(create, {'data': full_data}),
+        'mutation_update': lambda: run(update, {'id': str(instance.pk), 'data': full_data}),
+        'mutation_update_reduced': lambda: run(reduce, {'id': str(instance.pk), 'data': {'field0': 'reduced'}}),
+    }
+
+
+def conversion_cases(item_model, width):
+    from django import forms
+    from django_graphene_utils import clear_type_registry, convert_form, convert_form_errors, get_enum_from_field
+
+    attrs = {'field_%d' % index: forms.IntegerField(min_value=0) for index in range(width)}
+    wide_form = type('WideForm', (forms.Form,), attrs)
+    # every field is invalid
+    invalid_data = {'field_%d' % index: 'invalid' for index in range(width)}
+
+    def convert_errors():
+        form = wide_form(data=invalid_data)
+        form.is_valid()
+        convert_form_errors(form)
+
+    def build_types():
+        # measure a cold build
+        clear_type_registry()
+        convert_form(wide_form, name='WideInput')
+        get_enum_from_field(item_model, 'status')
+
+    def build_types_cached():
+        convert_form(wide_form, name='WideInput')
+        get_enum_from_field(item_model, 'status')
+
+    return {
+        'convert_form_errors': convert_errors,
+        'schema_types_build': build_types,
+        'schema_types_cached': build_types_cached,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--width', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--startup-runs', type=int, default=5)
+    parser.add_argument('--only', action='append', help='only run the given cases')
+    parser.add_argument('--output', help='write results into this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    category_model, item_model = bootstrap.setup(args.width)
+    bootstrap.populate(category_model, item_model, args.rows, args.width)
+
+    import django
+    import graphene
+
+    cases = {}
+    cases.update(pager_cases(item_model, args.rows))
+    cases.update(mutation_cases(item_model, args.width))
+    cases.update(conversion_cases(item_model, args.width))
+
+    results = {}
+
+    for name in sorted(cases):
+        if args.only and name not in args.only:
+            continue
+
+        results[name] = measure(cases[name], args.repeat)
+
+    report = {
+        'meta': {
+            'commit': get_commit(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'graphene': graphene.__version__,
+            'rows': args.rows,
+            'width': args.width,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+    if args.startup_runs:
+        report['startup'] = startup.main(['--runs', str(args.startup_runs)], output=None)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+
+    return report
+
+
+if __name__ == '__main__':
+    main()
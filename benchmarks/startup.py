@@ -0,0 +1,73 @@
+"""
+Measure the cold start cost of the package in fresh interpreters
+
+    python -m benchmarks.startup --runs 20
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# executed in a fresh interpreter for each run
+probe = """
+import json, sys, time
+start = time.perf_counter()
+import django_graphene_utils
+imported = time.perf_counter()
+loaded_modules = set(sys.modules)
+import django
+from django.conf import settings
+settings.configure()
+django.setup()
+ready = time.perf_counter()
+from django_graphene_utils import *
+members = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'members': members - ready,
+    'django_filters_on_import': 'django_filters' in loaded_modules,
+    'graphene_on_import': 'graphene' in loaded_modules,
+}))
+"""
+
+
+def run_probe():
+    output = subprocess.check_output([sys.executable, '-c', probe])
+
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def summarize(values):
+    return {
+        'min': min(values),
+        'median': statistics.median(values),
+        'max': max(values),
+    }
+
+
+def main(argv=None, output=sys.stdout):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    results = [run_probe() for _ in range(args.runs)]
+
+    report = {
+        'benchmark': 'startup',
+        'runs': args.runs,
+        'import_seconds': summarize([result['import'] for result in results]),
+        'members_seconds': summarize([result['members'] for result in results]),
+        'django_filters_on_import': any(result['django_filters_on_import'] for result in results),
+        'graphene_on_import': any(result['graphene_on_import'] for result in results),
+    }
+
+    if output is not None:
+        json.dump(report, output, indent=2)
+        output.write('\n')
+
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,67 @@
-from .forms import ReduceMixinForm
-from .generic import ModelFormMutation, FormMutation
-from .mixins import ReduceMixin
-from .pager import Pager
-from .utils import convert_filterset, convert_form, convert_form_errors, \
-    get_object_or_none, get_enum_from_field, get_enum_from_choices
+import sys
+from importlib import import_module
 
 __all__ = [
     'ReduceMixinForm',
     'ModelFormMutation',
     'FormMutation',
+    'DeleteMutation',
     'ReduceMixin',
     'Pager',
+    'PagerExportView',
+    'optimize_queryset',
     'convert_form',
     'convert_filterset',
     'convert_form_errors',
     'get_object_or_none',
+    'get_objects_or_none',
     'get_enum_from_choices',
     'get_enum_from_field',
+    'clear_type_registry',
 ]
+
+"""
+Modules are only imported once one of their members is required
+"""
+
+exports = {
+    'ReduceMixinForm': 'forms',
+    'ModelFormMutation': 'generic',
+    'FormMutation': 'generic',
+    'DeleteMutation': 'generic',
+    'ReduceMixin': 'mixins',
+    'Pager': 'pager',
+    'PagerExportView': 'views',
+    'optimize_queryset': 'optimizer',
+    'convert_form': 'utils',
+    'convert_filterset': 'utils',
+    'convert_form_errors': 'utils',
+    'get_object_or_none': 'utils',
+    'get_objects_or_none': 'utils',
+    'get_enum_from_choices': 'utils',
+    'get_enum_from_field': 'utils',
+    'clear_type_registry': 'utils',
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = exports[name]
+    except KeyError:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+    value = getattr(import_module('.%s' % module_name, __name__), name)
+    # keep it so we won't get there again
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(exports))
+
+
+if sys.version_info < (3, 7):
+    # module level __getattr__ is not supported, import everything now
+    for name in exports:
+        __getattr__(name)
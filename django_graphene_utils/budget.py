@@ -0,0 +1,155 @@
+import os
+import re
+import traceback
+import warnings
+from collections import OrderedDict
+from contextlib import ExitStack
+from django.db import connections
+
+__all__ = ['QueryGuard', 'QueryBudgetExceeded', 'QueryBudgetWarning', 'get_fingerprint']
+
+"""
+Fingerprint SQL so near-identical queries are grouped together
+"""
+
+fingerprint_substitutions = [
+    # string literals
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    # numbers (such as LIMIT 21)
+    (re.compile(r'\b\d+\b'), '?'),
+    # placeholders
+    (re.compile(r'%s'), '?'),
+    # lists of any length (such as IN clauses)
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+    # whitespaces
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def get_fingerprint(sql):
+    for pattern, replacement in fingerprint_substitutions:
+        sql = pattern.sub(replacement, sql)
+
+    return sql.strip()
+
+
+# frames from these packages won't be reported as the origin of a query
+library_paths = tuple(
+    os.path.dirname(module.__file__) + os.sep
+    for module in [__import__(name) for name in ('django', 'graphene', 'graphql', 'promise')]
+)
+package_path = os.path.dirname(__file__) + os.sep
+
+
+def get_location():
+    stack = traceback.extract_stack()
+    # prefer the project code, then fallback on our own code
+    candidates = [frame for frame in reversed(stack) if not frame.filename.startswith(library_paths)]
+    frame = next((frame for frame in candidates if not frame.filename.startswith(package_path)), None) or \
+        next((frame for frame in candidates if frame.filename != __file__), stack[0])
+
+    return '%s:%d in %s' % (frame.filename, frame.lineno, frame.name)
+
+
+"""
+Exceptions and warnings
+"""
+
+
+class QueryBudgetExceeded(Exception):
+    def __init__(self, message, report):
+        super(QueryBudgetExceeded, self).__init__(message)
+        # the offending queries
+        self.report = report
+
+
+class QueryBudgetWarning(UserWarning):
+    pass
+
+
+"""
+Guard counting queries of an execution against a budget
+"""
+
+
+class QueryGuard(object):
+    def __init__(self, name, max_queries=None, max_repeats=None, action='warn'):
+        assert action in ('warn', 'raise'), 'the action must be either warn or raise'
+        self.name = name
+        # the maximum number of queries
+        self.max_queries = max_queries
+        # the maximum number of times a single fingerprint may run
+        self.max_repeats = max_repeats
+        self.action = action
+        # fingerprints and locations of every query
+        self.queries = []
+        self.stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((get_fingerprint(sql), get_location()))
+
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        for connection in connections.all():
+            # watch every database
+            self.stack.enter_context(connection.execute_wrapper(self))
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stack.close()
+
+        if exc_type is None:
+            # do not hide another error
+            self.check()
+
+    def get_report(self):
+        # group queries by fingerprint keeping the order they first ran
+        report = OrderedDict()
+
+        for fingerprint, location in self.queries:
+            locations = report.setdefault(fingerprint, OrderedDict())
+            locations[location] = locations.get(location, 0) + 1
+
+        return report
+
+    def get_repeated(self):
+        if self.max_repeats is None:
+            return OrderedDict()
+
+        return OrderedDict(
+            (fingerprint, locations) for fingerprint, locations in self.get_report().items()
+            if sum(locations.values()) > self.max_repeats
+        )
+
+    def check(self):
+        problems = []
+        # report the likely N+1 patterns
+        report = repeated = self.get_repeated()
+
+        if self.max_queries is not None and len(self.queries) > self.max_queries:
+            problems.append('ran %d queries (budget is %d)' % (len(self.queries), self.max_queries))
+            # every query is to blame
+            report = self.get_report()
+
+        if repeated:
+            problems.append('repeated %d queries more than %d times' % (len(repeated), self.max_repeats))
+
+        if not problems:
+            return
+
+        lines = ['%s %s' % (self.name, ' and '.join(problems))]
+
+        for fingerprint, locations in report.items():
+            lines.append('  %dx %s' % (sum(locations.values()), fingerprint))
+
+            for location, count in locations.items():
+                lines.append('    %dx at %s' % (count, location))
+
+        message = '\n'.join(lines)
+
+        if self.action == 'raise':
+            raise QueryBudgetExceeded(message, report)
+
+        warnings.warn(message, QueryBudgetWarning)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import threading
+import time
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+__all__ = ['get_page_cache_stats', 'reset_page_cache_stats', 'invalidate_model']
+
+"""
+Statistics about cached pages
+"""
+
+page_cache_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+page_cache_stats_lock = threading.Lock()
+
+
+def count(name):
+    with page_cache_stats_lock:
+        page_cache_stats[name] += 1
+
+
+def get_page_cache_stats():
+    with page_cache_stats_lock:
+        return dict(page_cache_stats)
+
+
+def reset_page_cache_stats():
+    with page_cache_stats_lock:
+        for name in page_cache_stats:
+            page_cache_stats[name] = 0
+
+
+"""
+Version counters invalidating every cached page of a model at once
+"""
+
+# the cache aliases holding pages of each model
+watched_models = {}
+watched_models_lock = threading.Lock()
+
+
+def get_version_key(model):
+    return 'graphene_utils:page_version:%s' % model._meta.label_lower
+
+
+def new_version():
+    # counters may be evicted, starting from the clock never reuses an old version
+    return int(time.time() * 1000)
+
+
+def get_model_version(cache, model):
+    key = get_version_key(model)
+    version = cache.get(key, None)
+
+    if version is None:
+        # start a new counter (unless another process just did)
+        cache.add(key, new_version(), None)
+        version = cache.get(key, None) or new_version()
+
+    return version
+
+
+def bump_versions(model):
+    for alias in watched_models.get(model, ()):
+        cache = caches[alias]
+
+        try:
+            cache.incr(get_version_key(model))
+        except ValueError:
+            # the counter is gone, start a new one
+            cache.add(get_version_key(model), new_version(), None)
+
+
+def invalidate_model(model):
+    count('invalidations')
+    bump_versions(model)
+    # readers may have cached the old rows before the transaction got committed
+    transaction.on_commit(lambda: bump_versions(model))
+
+
+def on_change(sender, **kwargs):
+    invalidate_model(sender)
+
+
+def watch_model(model, alias):
+    with watched_models_lock:
+        aliases = watched_models.setdefault(model, set())
+
+        if alias in aliases:
+            # already watched
+            return
+
+        aliases.add(alias)
+
+    # queryset.update() and bulk operations do not send signals,
+    # those writes require to call invalidate_model
+    post_save.connect(on_change, sender=model, weak=False, dispatch_uid='graphene_utils_page_cache')
+    post_delete.connect(on_change, sender=model, weak=False, dispatch_uid='graphene_utils_page_cache')
+
+
+"""
+Store pages as lists of primary keys
+"""
+
+
+def get_page_key(cache, queryset, data):
+    # inputs are normalized so equivalent requests share the same page
+    normalized = json.dumps([
+        # databases (e.g. a lagging replica) may hold other rows
+        queryset.db,
+        str(queryset.query),
+        data.get('offset', 0) or 0,
+        data.get('size', None),
+        list(data.get('sort', None) or []),
+        data.get('after', None),
+        data.get('before', None),
+        data.get('count', None),
+    ], cls=DjangoJSONEncoder)
+
+    return 'graphene_utils:page:%s:%s:%s' % (
+        queryset.model._meta.label_lower,
+        get_model_version(cache, queryset.model),
+        hashlib.sha1(normalized.encode()).hexdigest(),
+    )
@@ -1,6 +1,13 @@
-from collections import OrderedDict
+import copy
+import pickle
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.forms import FileField, ModelChoiceField
 
-__all__ = ['ReduceMixinForm']
+__all__ = ['ReduceMixinForm', 'ConcurrentCleanMixinForm']
 
 """
 Provide a mixin to dynamically reduce forms to deal with pushed fields only
@@ -8,19 +15,217 @@ Provide a mixin to dynamically reduce forms to deal with pushed fields only
 
 no_reducing = object()
 
+# statistics about cached reduced form classes
+ReducedCacheInfo = namedtuple('ReducedCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+reduced_classes_lock = threading.Lock()
+
 
 class ReduceMixinForm(object):
+    # build (and cache) form classes declaring the pushed fields only, so the constructor
+    # doesn't copy the other ones; __init__ of such forms only sees the pushed fields
+    cache_reduced_classes = False
+    # the maximum number of reduced form classes kept per form class
+    reduced_classes_size = 128
+
+    def __new__(cls, *args, **kwargs):
+        reduce_to = kwargs.get('reduce_to', no_reducing)
+
+        if cls.cache_reduced_classes and reduce_to is not no_reducing and not cls.__dict__.get('_is_reduced', False):
+            # use a form class declaring the pushed fields only
+            cls = cls.get_reduced_class(reduce_to)
+
+        return super(ReduceMixinForm, cls).__new__(cls)
+
     def __init__(self, *args, **kwargs):
         # get pushed fields and pop the argument from the other named
         self._reduce_to = kwargs.pop('reduce_to', no_reducing)
         # call the parent constructor to maintains everything on
         # whatever the form parent would be
         super(ReduceMixinForm, self).__init__(*args, **kwargs)
-        # we may now reduce the field list
-        self.original_fields = self.fields
+        # we may now reduce the field list (reduced classes only copy them on demand)
+        self._original_fields = None if self.__class__.__dict__.get('_is_reduced', False) else self.fields
         # however the reducing feature might be disable (and is by default)
         if self._reduce_to is not no_reducing:
             # but so far it has been required to limit fields
             self.fields = OrderedDict(
                 (name, self.fields[name]) for name in self._reduce_to
             )
+
+    @property
+    def original_fields(self):
+        if self._original_fields is None:
+            # copy them from the class we've been reduced from
+            self._original_fields = copy.deepcopy(self.__class__.__bases__[0].base_fields)
+
+        return self._original_fields
+
+    @classmethod
+    def get_reduced_class(cls, names):
+        key = frozenset(names)
+
+        with reduced_classes_lock:
+            if '_reduced_classes' not in cls.__dict__:
+                # each form class has its own cache
+                cls._reduced_classes = OrderedDict()
+                cls._reduced_stats = [0, 0]
+
+            reduced_class = cls._reduced_classes.get(key, None)
+
+            if reduced_class is not None:
+                # mark it as recently used
+                cls._reduced_classes.move_to_end(key)
+                cls._reduced_stats[0] += 1
+
+                return reduced_class
+
+            cls._reduced_stats[1] += 1
+
+        # build it outside the lock
+        reduced_class = cls.build_reduced_class(key)
+
+        with reduced_classes_lock:
+            cls._reduced_classes[key] = reduced_class
+
+            while len(cls._reduced_classes) > cls.reduced_classes_size:
+                # drop the least recently used
+                cls._reduced_classes.popitem(last=False)
+
+        return reduced_class
+
+    @classmethod
+    def build_reduced_class(cls, names):
+        # keep the ordering of the original form
+        base_fields = OrderedDict((name, field) for name, field in cls.base_fields.items() if name in names)
+        attrs = {'_is_reduced': True, '__module__': cls.__module__}
+        meta = getattr(cls, 'Meta', None)
+
+        if getattr(meta, 'model', None) is not None:
+            # model forms must only read and write those fields on the instance
+            attrs['Meta'] = type('Meta', (meta,), {'fields': list(base_fields)})
+
+        reduced_class = type(cls.__name__, (cls,), attrs)
+        # the meta class might have collected other fields
+        reduced_class.base_fields = base_fields
+
+        return reduced_class
+
+    @classmethod
+    def reduced_cache_info(cls):
+        stats = cls.__dict__.get('_reduced_stats', [0, 0])
+        classes = cls.__dict__.get('_reduced_classes', {})
+
+        return ReducedCacheInfo(stats[0], stats[1], cls.reduced_classes_size, len(classes))
+
+    @classmethod
+    def reduced_cache_clear(cls):
+        with reduced_classes_lock:
+            cls._reduced_classes = OrderedDict()
+            cls._reduced_stats = [0, 0]
+
+
+"""
+Provide a mixin cleaning fields concurrently
+"""
+
+# executors shared by every form (by kind and size)
+executors = {}
+executors_lock = threading.Lock()
+
+
+def get_executor(kind, workers):
+    with executors_lock:
+        executor = executors.get((kind, workers), None)
+
+        if executor is None:
+            executor_class = ProcessPoolExecutor if kind == 'process' else ThreadPoolExecutor
+            executor = executors[(kind, workers)] = executor_class(max_workers=workers)
+
+        return executor
+
+
+def clean_field(field, value, initial, is_file):
+    # must be picklable to run in a process pool
+    return field.clean(value, initial) if is_file else field.clean(value)
+
+
+def run_and_close_connections(func, *args):
+    try:
+        return func(*args)
+    finally:
+        # do not leak connections opened by the worker
+        connections.close_all()
+
+
+def get_result(func, *args):
+    try:
+        return func(*args), None
+    except ValidationError as error:
+        return None, error
+
+
+class ConcurrentCleanMixinForm(object):
+    # the number of threads (and processes) cleaning fields
+    clean_workers = 4
+    # fields whose validators are CPU bound run in a process pool
+    cpu_bound_fields = ()
+
+    def _clean_fields(self):
+        arguments = OrderedDict()
+        tasks = OrderedDict()
+
+        for name, field in self.fields.items():
+            # value_from_datadict() gets the data from the data dictionaries.
+            if field.disabled:
+                value = self.get_initial_for_field(field, name)
+            else:
+                value = field.widget.value_from_datadict(self.data, self.files, self.add_prefix(name))
+
+            is_file = isinstance(field, FileField)
+            arguments[name] = (field, value, self.get_initial_for_field(field, name) if is_file else None, is_file)
+
+            if isinstance(field, ModelChoiceField):
+                # queries must run on the connection (and transaction) of the request
+                continue
+
+            if name in self.cpu_bound_fields:
+                tasks[name] = ('process', get_executor('process', self.clean_workers).submit(
+                    clean_field, *arguments[name]
+                ))
+            else:
+                tasks[name] = ('thread', get_executor('thread', self.clean_workers).submit(
+                    run_and_close_connections, clean_field, *arguments[name]
+                ))
+
+        results = {}
+
+        for name, args in arguments.items():
+            if name not in tasks:
+                results[name] = get_result(clean_field, *args)
+
+        for name, (kind, future) in tasks.items():
+            try:
+                results[name] = get_result(future.result)
+            except (pickle.PicklingError, AttributeError, TypeError):
+                if kind != 'process':
+                    raise
+
+                # the field cannot go to another process, clean it here
+                results[name] = get_result(clean_field, *arguments[name])
+
+        # then follow the steps of django in field order, clean_<field> methods
+        # run on this thread as they may read earlier cleaned values or query the database
+        for name in self.fields:
+            value, error = results[name]
+
+            if error is not None:
+                self.add_error(name, error)
+                continue
+
+            self.cleaned_data[name] = value
+
+            if hasattr(self, 'clean_%s' % name):
+                try:
+                    self.cleaned_data[name] = getattr(self, 'clean_%s' % name)()
+                except ValidationError as error:
+                    self.add_error(name, error)
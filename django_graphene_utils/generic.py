@@ -1,14 +1,75 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import time
 import graphene
-from django.db.models import QuerySet
+from django.core.cache import caches
+from django.core.exceptions import NON_FIELD_ERRORS, ObjectDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connections, router, transaction
+from django.db.models import ProtectedError, QuerySet, prefetch_related_objects
+from django.forms.models import BaseModelForm
 from django.utils import six
+from django.utils.encoding import force_text
 from django.utils.decorators import classonlymethod
 from django.shortcuts import _get_queryset
 from graphene.utils.props import props
+from graphene.utils.str_converters import to_camel_case
 from graphene_django.registry import get_global_registry
+from .budget import QueryGuard
+from .caching import invalidate_model
+from .forms import ConcurrentCleanMixinForm
+from .instrumentation import Measure, no_measure
 from .types import FormError
+from .loaders import InstanceLoader, get_instance_loader, get_sibling_arguments
+from .optimizer import get_field_nodes, get_optimization
+from .routing import get_alias, stick_to_database
+from .unique import BatchUniqueMixinForm, validate_unique_batch
 from .utils import convert_form_errors
 
-__all__ = ['ModelFormMutation', 'FormMutation']
+__all__ = ['ModelFormMutation', 'FormMutation', 'DeleteMutation']
+
+"""
+Helpers for the asynchronous mode
+"""
+
+
+def run_in_thread(func, *args):
+    # connections are bound to threads, clean them up like a request would
+    close_old_connections()
+
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+def ensure_async(func):
+    async def wrapper(*args):
+        result = func(*args)
+
+        if inspect.isawaitable(result):
+            # it may come from a coroutine
+            result = await result
+
+        return result
+
+    return wrapper
+
+
+"""
+Helpers for partial updates
+"""
+
+
+def get_loaded_state(instance):
+    # deferred columns are not in the dict of the instance
+    return {
+        field.attname: instance.__dict__[field.attname]
+        for field in instance._meta.concrete_fields if field.attname in instance.__dict__
+    }
+
 
 """
 Base Form mutation
@@ -35,32 +96,153 @@ class BaseFormMutation(object):
     def build_form(self, root, args, context, info):
         return self._meta.form_class(**self.get_form_kwargs(root, args, context, info))
 
+    def measure(self, phase):
+        if not self._meta.instrument:
+            # nothing to record
+            return no_measure
+
+        return Measure(self.__class__.__name__, phase)
+
+    def guard(self):
+        if self._meta.max_queries is None and self._meta.max_repeated_queries is None:
+            # no budget to enforce
+            return no_measure
+
+        return QueryGuard(
+            self.__class__.__name__,
+            max_queries=self._meta.max_queries,
+            max_repeats=self._meta.max_repeated_queries,
+            action=self._meta.query_budget_action,
+        )
+
     def _execute(self, root, args, context, info):
-        # first build the form
-        form = self.form = self.build_form(root, args, context, info)
-
-        # check its validity
-        if form.is_valid():
-            # the form is valid
-            # continue on the successful method
-            response = self.get_successful_response(root, args, context, info, form)
+        key = self.get_idempotency_key(root, args, context, info)
+
+        if key is None:
+            response = self.get_response(root, args, context, info)
         else:
-            # invalid form
-            # move on the unsuccessful method
-            response = self.get_unsuccessful_response(root, args, context, info, form)
+            # retries get the response of the first execution
+            response = self.get_idempotent_response(key, root, args, context, info)
 
         return self.mutation(**response)
 
+    def get_idempotency_key(self, root, args, context, info):
+        if not self._meta.idempotency:
+            return None
+
+        client_key = args.get(self._meta.input_idempotency_key, None)
+
+        if not client_key:
+            # the client didn't ask for it
+            return None
+
+        # the same key with other inputs is another request
+        data = {key: value for key, value in args.items() if key != self._meta.input_idempotency_key}
+        digest = hashlib.sha1(json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder, default=str).encode())
+
+        # keys picked by a client never collide with keys of another one
+        scope = self.get_idempotency_scope(root, args, context, info)
+        client_key = json.dumps([force_text(scope) if scope is not None else None, force_text(client_key)])
+
+        return 'graphene_utils:idempotency:%s.%s:%s:%s' % (
+            self.__class__.__module__, self.__class__.__name__,
+            hashlib.sha1(client_key.encode()).hexdigest(),
+            digest.hexdigest(),
+        )
+
+    def get_idempotency_scope(self, root, args, context, info):
+        user = getattr(context, 'user', None)
+
+        if user is not None and user.is_authenticated:
+            return 'user:%s' % user.pk
+
+        session = getattr(context, 'session', None)
+
+        if session is not None and session.session_key:
+            # anonymous clients are told apart by their session
+            return 'session:%s' % session.session_key
+
+        # every anonymous client shares the same keys
+        return None
+
+    def get_idempotent_response(self, key, root, args, context, info):
+        cache = caches[self._meta.idempotency_cache]
+        lock_key = '%s:lock' % key
+        deadline = time.monotonic() + self._meta.idempotency_wait
+
+        while True:
+            response = cache.get(key, None)
+
+            if response is not None:
+                # it already ran
+                return response
+
+            # the lock expires in case we die while holding it, so idempotency_lock_timeout
+            # must exceed the slowest execution or a duplicate may run concurrently
+            if cache.add(lock_key, True, self._meta.idempotency_lock_timeout):
+                try:
+                    response = self.get_response(root, args, context, info)
+                    cache.set(key, response, self._meta.idempotency_timeout)
+                finally:
+                    cache.delete(lock_key)
+
+                return response
+
+            if time.monotonic() >= deadline:
+                break
+
+            # another request with the same key is running, wait for it
+            time.sleep(self._meta.idempotency_poll)
+
+        return {
+            self._meta.output_error_key: [FormError(
+                key=NON_FIELD_ERRORS,
+                message='A request with the same idempotency key is still running.',
+            )],
+            self._meta.output_success_key: False,
+        }
+
+    def get_response(self, root, args, context, info):
+        # the whole execution must fit in the query budget
+        with self.guard():
+            # first build the form
+            with self.measure('build_form'):
+                form = self.form = self.build_form(root, args, context, info)
+
+            # check its validity
+            with self.measure('is_valid'):
+                is_valid = form.is_valid()
+
+            if is_valid:
+                # the form is valid
+                # continue on the successful method
+                response = self.get_successful_response(root, args, context, info, form)
+            else:
+                # invalid form
+                # move on the unsuccessful method
+                response = self.get_unsuccessful_response(root, args, context, info, form)
+
+        return response
+
     def execute(self, root, args, context, info):
         return self.__class__._execute_chain(self, root, args, context, info)
 
+    def run_async(self, func, root, args, context, info):
+        # run it in the executor without blocking the event loop
+        loop = asyncio.get_event_loop()
+
+        return loop.run_in_executor(self._meta.executor, run_in_thread, func, root, args, context, info)
+
     def get_successful_response(self, root, args, context, info, form):
         return {self._meta.output_success_key: True}
 
     def get_unsuccessful_response(self, root, args, context, info, form):
+        with self.measure('convert_errors'):
+            errors = convert_form_errors(form)
+
         # the error is obviously provide
         return {
-            self._meta.output_error_key: convert_form_errors(form),
+            self._meta.output_error_key: errors,
             self._meta.output_success_key: False,
         }
 
@@ -76,6 +258,10 @@ class BaseFormMutation(object):
 
             return self.execute(root, args, context, info)
 
+        if cls._meta.asynchronous:
+            # the executor will await it
+            mutate = ensure_async(mutate)
+
         return type(
             # keep the name of the class
             cls.__name__,
@@ -93,52 +279,483 @@ class BaseFormMutation(object):
         )
 
 
+"""
+Mixin picking the queryset and the database of model mutations
+"""
+
+
+class ModelMutationMixin(object):
+    def get_queryset(self, root, args, context, info):
+        # get the queryset first
+        queryset = self._meta.queryset
+
+        # it might be a function to call
+        if callable(queryset):
+            # call it to get our queryset
+            queryset = queryset(root, args, context, info)
+
+        # ensure we've a queryset
+        assert isinstance(queryset, QuerySet)
+
+        return queryset
+
+    def get_using(self, root, args, context, info):
+        using = get_alias(self._meta.using, root, args, context, info)
+
+        # rows about to be written are read from (and written to) the primary
+        return using or router.db_for_write(self._meta.model)
+
+
 """
 Base class for model form mutation
 """
 
 
-class BaseModelFormMutation(BaseFormMutation):
+class BaseModelFormMutation(ModelMutationMixin, BaseFormMutation):
+    # the loader holding instances fetched ahead
+    instance_loader = None
+
     def get_form_kwargs(self, root, args, context, info):
         # get original kwargs
         kwargs = super(BaseModelFormMutation, self).get_form_kwargs(root, args, context, info)
         # add the instance
-        kwargs['instance'] = self.get_instance(root, args, context, info)
+        with self.measure('get_instance'):
+            kwargs['instance'] = self.get_instance(root, args, context, info)
 
         return kwargs
 
+    def get_lookup_queryset(self, root, args, context, info, fields=None):
+        queryset = self.get_queryset(root, args, context, info).using(self.get_using(root, args, context, info))
+
+        if fields is None:
+            # use the columns required by the form
+            fields = self._meta.instance_fields
+
+        if fields:
+            # do not load columns we won't use
+            queryset = queryset.only(*fields)
+
+        return queryset
+
+    def get_instance_fields(self, root, args, context, info):
+        return self._meta.instance_fields
+
     def get_instance(self, root, args, context, info):
         if not self._meta.filter:
             # we don't need to get an instance
             return None
 
-        # get the queryset first
-        queryset = self._meta.queryset
+        filter = dict(self._meta.filter(root, args, context, info))
 
-        # it might be a function to call
-        if callable(queryset):
-            # call it to get our queryset
-            queryset = queryset(root, args, context, info)
+        if self.instance_loader is not None:
+            # it has been loaded ahead
+            return self.instance_loader.get(filter)
 
-        # ensure we've a queryset
-        assert isinstance(queryset, QuerySet)
+        if not self._meta.batch_lookups:
+            # columns may depend on the request
+            fields = self.get_instance_fields(root, args, context, info)
+            # we may now get the object
+            return self.get_lookup_queryset(root, args, context, info, fields).get(**filter)
+
+        queryset = self.get_lookup_queryset(root, args, context, info)
 
-        # we may now get the object
-        return queryset.get(**dict(self._meta.filter(root, args, context, info)))
+        # use the identity map of the request
+        loader = get_instance_loader(context, queryset)
+
+        if filter not in loader:
+            # load instances for every pending mutation of this kind at once
+            loader.load_many([filter] + [
+                dict(self._meta.filter(root, sibling_args, context, info))
+                for sibling_args in get_sibling_arguments(info)
+            ])
+
+        return loader.get(filter)
+
+    def get_unsuccessful_response(self, root, args, context, info, form):
+        if self._meta.batch_lookups and form.instance is not None:
+            # the instance has been changed by the invalid form
+            get_instance_loader(context, self.get_lookup_queryset(root, args, context, info)).discard(form.instance)
+
+        return super(BaseModelFormMutation, self).get_unsuccessful_response(root, args, context, info, form)
 
     def get_successful_response(self, root, args, context, info, form):
         # get the original response
-        response = super(BaseModelFormMutation, self).get_successful_response(root, args, context, info)
+        response = super(BaseModelFormMutation, self).get_successful_response(root, args, context, info, form)
 
         # save the form
-        instance = form.save(commit=self._meta.commit)
+        with self.measure('save'):
+            instance = self.save_form(root, args, context, info, form)
+
+        if self._meta.commit and self._meta.sticky:
+            # next reads of the request must see this write
+            stick_to_database(context, self._meta.model, instance._state.db)
 
         if self._meta.output_instance_key:
+            if self._meta.optimize_output and self._meta.commit and info is not None:
+                # load what the client selected on it
+                instance = self.load_output_instances([instance], info, [self._meta.output_instance_key])[0]
+
             # we must provide the instance
             response[self._meta.output_instance_key] = instance
 
         return response
 
+    def load_output_instances(self, instances, info, path):
+        # get the nodes selecting the instance
+        nodes = get_field_nodes(info, [to_camel_case(name) for name in path])
+        # instances without primary keys (not returned by bulk inserts) cannot be loaded
+        saved = [instance for instance in instances if instance.pk is not None]
+
+        if not nodes or not saved:
+            # nothing to load
+            return instances
+
+        optimization = get_optimization(self._meta.model, nodes, info.fragments, self._meta.registry)
+        # single relations are fetched like many ones (relations already cached are skipped)
+        lookups = optimization.select_related + optimization.prefetch_related
+
+        if lookups:
+            for instance in saved:
+                # relations may have changed on save
+                instance.__dict__.pop('_prefetched_objects_cache', None)
+
+            # load relations of every instance at once
+            prefetch_related_objects(saved, *lookups)
+
+        return instances
+
+    def build_form(self, root, args, context, info):
+        form = super(BaseModelFormMutation, self).build_form(root, args, context, info)
+
+        if self._meta.partial_updates and not form.instance._state.adding:
+            # remember values as loaded to find out which columns the form changed
+            form.loaded_state = get_loaded_state(form.instance)
+
+        return form
+
+    def get_update_fields(self, form):
+        if getattr(form, 'loaded_state', None) is None or form.instance._state.adding:
+            # the whole row is written
+            return None
+
+        if type(form).save is not BaseModelForm.save:
+            # the form may change the instance on its own, let it save
+            return None
+
+        instance = form.instance
+        loaded_state = form.loaded_state
+
+        # compare every column we hold (including those set by clean methods) with its loaded value
+        return [
+            field.name for field in instance._meta.concrete_fields
+            if not field.primary_key and field.attname in instance.__dict__ and (
+                field.attname not in loaded_state or instance.__dict__[field.attname] != loaded_state[field.attname]
+            )
+        ]
+
+    def save_form(self, root, args, context, info, form):
+        if not self._meta.commit:
+            return form.save(commit=False)
+
+        update_fields = self.get_update_fields(form)
+
+        if update_fields is None:
+            if form.instance._state.adding and self._meta.using is not None:
+                # routers write new instances to the database they're bound to
+                form.instance._state.db = self.get_using(root, args, context, info)
+
+            # updated instances are written where they have been read from
+            return form.save()
+
+        instance = form.save(commit=False)
+
+        # like django with empty update_fields, nothing is written (nor signaled) when nothing changed
+        if update_fields:
+            # only write columns which changed (and those updated automatically)
+            instance.save(update_fields=update_fields + [
+                field.name for field in instance._meta.concrete_fields
+                if getattr(field, 'auto_now', False) and field.name not in update_fields
+            ])
+
+        if any(field.name in form.changed_data for field in instance._meta.many_to_many):
+            # relations may have changed as well
+            form.save_m2m()
+
+        return instance
+
+    def get_bulk_items(self, args):
+        # every input is a list of values
+        count = max([len(values or []) for values in args.values()] or [0])
+
+        # rebuild the arguments of each item
+        return [
+            {key: values[index] if values and index < len(values) else None for key, values in args.items()}
+            for index in range(count)
+        ]
+
+    def preload_instances(self, root, items, context, info):
+        queryset = self.get_lookup_queryset(root, self.args, context, info)
+
+        if self._meta.batch_lookups:
+            # share the identity map of the request
+            self.instance_loader = get_instance_loader(context, queryset)
+        else:
+            self.instance_loader = InstanceLoader(queryset)
+
+        # fetch instances for all items at once
+        self.instance_loader.load_many([dict(self._meta.filter(root, item, context, info)) for item in items])
+
+    def save_bulk(self, forms):
+        # build instances without saving them
+        instances = [form.save(commit=False) for form in forms]
+
+        if not self._meta.commit:
+            return instances
+
+        model = self._meta.model
+        using = self.get_using(self.root, self.args, self.context, self.info)
+        features = connections[using].features
+        # primary keys are required to save many to many relations
+        can_return_ids = getattr(features, 'can_return_rows_from_bulk_insert', False) or \
+            getattr(features, 'can_return_ids_from_bulk_insert', False)
+
+        created, saved, updated, names = [], [], [], set()
+
+        for form, instance in zip(forms, instances):
+            if not instance._state.adding:
+                update_fields = self.get_update_fields(form)
+
+                if update_fields == []:
+                    # nothing to write
+                    continue
+
+                updated.append(instance)
+                # collect columns the forms may have changed
+                names.update(form.cleaned_data if update_fields is None else update_fields)
+            elif can_return_ids or not any(field.name in form.cleaned_data for field in model._meta.many_to_many):
+                created.append(instance)
+            else:
+                # it must be inserted on its own to get its primary key
+                saved.append(instance)
+
+        # bulk_update only deals with concrete fields
+        fields = [
+            field for field in model._meta.concrete_fields
+            if not field.primary_key and (field.name in names or getattr(field, 'auto_now', False))
+        ]
+
+        if self._meta.sticky:
+            # next reads of the request must see these writes
+            stick_to_database(self.context, model, using)
+
+        with transaction.atomic(using=using):
+            for instance in saved:
+                instance.save(using=using)
+
+            if created:
+                model._default_manager.db_manager(using).bulk_create(created)
+
+            if updated and fields:
+                for instance in updated:
+                    for field in fields:
+                        # bulk_update doesn't refresh auto_now fields
+                        if getattr(field, 'auto_now', False):
+                            field.pre_save(instance, False)
+
+                model._default_manager.db_manager(using).bulk_update(updated, [field.name for field in fields])
+
+            for form in forms:
+                # relations are saved once instances exist
+                form.save_m2m()
+
+        if created or (updated and fields):
+            # bulk operations send no signals, cached pages must be dropped ourselves
+            invalidate_model(model)
+
+        return instances
+
+    def execute_bulk(self, root, args, context, info):
+        items = self.get_bulk_items(args)
+
+        if self._meta.filter:
+            # load every instance in a single query
+            self.preload_instances(root, items, context, info)
+
+        responses = []
+        valid_forms = []
+
+        for index, item in enumerate(items):
+            try:
+                with self.measure('build_form'):
+                    form = self.build_form(root, item, context, info)
+            except ObjectDoesNotExist as error:
+                # the instance to update doesn't exist
+                responses.append({
+                    self._meta.output_error_key: [FormError(key=NON_FIELD_ERRORS, message=force_text(error))],
+                    self._meta.output_success_key: False,
+                })
+                continue
+
+            if self._meta.batch_unique_checks:
+                # uniqueness is checked for the whole batch below
+                form.defer_unique_checks = True
+
+            with self.measure('is_valid'):
+                is_valid = form.is_valid()
+
+            if is_valid:
+                # keep it to save it later
+                valid_forms.append((index, item, form))
+                responses.append(None)
+            else:
+                responses.append(self.get_unsuccessful_response(root, item, context, info, form))
+
+        if self._meta.batch_unique_checks and valid_forms:
+            with self.measure('is_valid'):
+                # a single query for every item, and duplicates within the batch
+                validate_unique_batch([form for index, item, form in valid_forms])
+
+            for index, item, form in valid_forms:
+                if form.errors:
+                    responses[index] = self.get_unsuccessful_response(root, item, context, info, form)
+
+            valid_forms = [(index, item, form) for index, item, form in valid_forms if not form.errors]
+
+        # save valid forms at once
+        with self.measure('save'):
+            instances = self.save_bulk([form for index, item, form in valid_forms])
+
+        if self._meta.output_instance_key and self._meta.optimize_output and self._meta.commit:
+            # load what the client selected on them
+            instances = self.load_output_instances(
+                instances, info, [self._meta.output_results_key, self._meta.output_instance_key]
+            )
+
+        for (index, item, form), instance in zip(valid_forms, instances):
+            # skip the model save and use the base response
+            response = super(BaseModelFormMutation, self).get_successful_response(root, item, context, info, form)
+
+            if self._meta.output_instance_key:
+                # we must provide the instance
+                response[self._meta.output_instance_key] = instance
+
+            responses[index] = response
+
+        return self.mutation(**{
+            self._meta.output_success_key: all(response[self._meta.output_success_key] for response in responses),
+            self._meta.output_results_key: [self._bulk_result_type(**response) for response in responses],
+        })
+
+    def execute_bulk_guarded(self, root, args, context, info):
+        # the whole batch must fit in the query budget
+        with self.guard():
+            return self.execute_bulk(root, args, context, info)
+
+    @classonlymethod
+    def as_bulk_mutation(cls, **initkwargs):
+        def mutate(mutation, root, args, context, info):
+            self = cls(**initkwargs)
+            self.mutation = mutation
+            self.root = root
+            self.args = args
+            self.context = context
+            self.info = info
+
+            return cls._bulk_execute_chain(self, root, args, context, info)
+
+        if cls._meta.asynchronous:
+            # the executor will await it
+            mutate = ensure_async(mutate)
+
+        if '_bulk_result_type' not in cls.__dict__:
+            # the type of each result
+            cls._bulk_result_type = type('%sResult' % cls.__name__, (graphene.ObjectType,), dict(cls._output_attrs))
+
+        # every input turns into a list
+        input_attrs = {}
+
+        for key, value in props(cls._input).items():
+            if cls._meta.idempotency and key == cls._meta.input_idempotency_key:
+                # retrying a whole batch is not supported
+                continue
+
+            argument = value if isinstance(value, graphene.Argument) else value.Argument()
+            input_attrs[key] = graphene.List(argument.type, required=isinstance(argument.type, graphene.NonNull))
+
+        return type(
+            # keep the name of the class
+            'Bulk%s' % cls.__name__,
+            # define it as final mutation
+            (graphene.Mutation,),
+            # and here comes attributes
+            {
+                # the inputs
+                'Input': type('Input', (object,), input_attrs),
+                # the mutate method will instance this class
+                'mutate': classmethod(mutate),
+                # provide output
+                cls._meta.output_success_key: graphene.Boolean(required=True),
+                cls._meta.output_results_key: graphene.List(cls._bulk_result_type),
+            },
+        )
+
+
+"""
+Base class for delete mutation
+"""
+
+
+class BaseDeleteMutation(ModelMutationMixin, BaseFormMutation):
+    def get_filter(self, root, args, context, info):
+        filter = {}
+
+        for key, value in self._meta.filter(root, args, context, info):
+            if isinstance(value, (list, tuple)):
+                # delete many at once
+                filter['%s__in' % key] = value
+            else:
+                filter[key] = value
+
+        return filter
+
+    def get_delete_queryset(self, root, args, context, info):
+        queryset = self.get_queryset(root, args, context, info).using(self.get_using(root, args, context, info))
+
+        # the ordering doesn't matter to delete rows
+        return queryset.filter(**self.get_filter(root, args, context, info)).order_by()
+
+    def delete(self, queryset):
+        # django runs a single DELETE itself when there are no cascades nor signal receivers
+        count, counts = queryset.delete()
+
+        # only report the rows of our model
+        return counts.get(queryset.model._meta.label, 0)
+
+    def get_response(self, root, args, context, info):
+        # the whole execution must fit in the query budget
+        with self.guard():
+            queryset = self.get_delete_queryset(root, args, context, info)
+
+            try:
+                with self.measure('delete'):
+                    count = self.delete(queryset)
+            except ProtectedError as error:
+                # other objects still require them
+                return {
+                    self._meta.output_error_key: [FormError(key=NON_FIELD_ERRORS, message=force_text(error.args[0]))],
+                    self._meta.output_success_key: False,
+                    self._meta.output_count_key: 0,
+                }
+
+        if count and self._meta.sticky:
+            # next reads of the request must see this delete
+            stick_to_database(context, self._meta.model, queryset.db)
+
+        return {
+            self._meta.output_success_key: True,
+            self._meta.output_count_key: count,
+        }
+
 
 """
 Options/settings for form mutation
@@ -163,6 +780,41 @@ class Options(object):
         # middlewares
         self.middlewares = getattr(options, 'middlewares', [])
 
+        # produce an asynchronous mutate running forms in an executor
+        self.asynchronous = getattr(options, 'asynchronous', False)
+        # the executor (the default one of the event loop if none)
+        self.executor = getattr(options, 'executor', None)
+
+        # record time and queries of each phase
+        self.instrument = getattr(options, 'instrument', False)
+
+        # let clients retry with an idempotency key
+        self.idempotency = getattr(options, 'idempotency', False)
+        self.input_idempotency_key = getattr(options, 'input_idempotency_key', 'idempotency_key')
+        # the alias of the django cache holding responses
+        self.idempotency_cache = getattr(options, 'idempotency_cache', 'default')
+        # how long responses are kept (in seconds)
+        self.idempotency_timeout = getattr(options, 'idempotency_timeout', 86400)
+        # how long a duplicate waits for the first request (in seconds)
+        self.idempotency_wait = getattr(options, 'idempotency_wait', 10)
+        self.idempotency_poll = getattr(options, 'idempotency_poll', 0.05)
+        # how long the first request holds the key (in seconds), longer than the slowest execution
+        self.idempotency_lock_timeout = getattr(options, 'idempotency_lock_timeout', 300)
+
+        # clean fields of the form concurrently
+        self.concurrent_clean = getattr(options, 'concurrent_clean', False)
+        # the size of the pools
+        self.clean_workers = getattr(options, 'clean_workers', 4)
+        # fields whose validators are CPU bound (cleaned in a process pool)
+        self.cpu_bound_fields = getattr(options, 'cpu_bound_fields', ())
+
+        # the maximum number of queries an execution may run
+        self.max_queries = getattr(options, 'max_queries', None)
+        # the maximum number of times the same query may run (to catch N+1 patterns)
+        self.max_repeated_queries = getattr(options, 'max_repeated_queries', None)
+        # either warn or raise when going over budget
+        self.query_budget_action = getattr(options, 'query_budget_action', 'warn')
+
 
 """
 Options/settings for model form mutation
@@ -178,11 +830,36 @@ class ModelOptions(Options):
 
         # the output keys
         self.output_instance_key = getattr(options, 'output_instance_key', None)
+        self.output_results_key = getattr(options, 'output_results_key', 'results')
 
         # we might have a queryset to follow
         self.queryset = getattr(options, 'queryset', None)
         self.filter = getattr(options, 'filter', None)
 
+        # batch instance lookups of a request and keep them in an identity map
+        self.batch_lookups = getattr(options, 'batch_lookups', False)
+
+        # only load columns required by the form
+        self.prune_columns = getattr(options, 'prune_columns', False)
+        # extra columns required by custom clean methods
+        self.required_fields = getattr(options, 'required_fields', ())
+        # the columns to load (computed by the meta class)
+        self.instance_fields = None
+
+        # run uniqueness checks of the form with a single query
+        self.batch_unique_checks = getattr(options, 'batch_unique_checks', False)
+
+        # only update the columns a form changed on existing instances
+        self.partial_updates = getattr(options, 'partial_updates', False)
+
+        # the primary database, either an alias or a callable receiving (root, args, context, info)
+        self.using = getattr(options, 'using', None)
+        # reads of the model go to the primary for the rest of the request once written
+        self.sticky = getattr(options, 'sticky', True)
+
+        # load relations selected on the output instance
+        self.optimize_output = getattr(options, 'optimize_output', False)
+
         # from the form get the model
         self.model = self.form_class._meta.model
 
@@ -191,6 +868,38 @@ class ModelOptions(Options):
             self.queryset = _get_queryset(self.model)
 
 
+"""
+Options/settings for delete mutation
+"""
+
+
+class DeleteOptions(Options):
+    def __init__(self, options=None):
+        super(DeleteOptions, self).__init__(options)
+
+        # the output keys
+        self.output_count_key = getattr(options, 'output_count_key', 'count')
+
+        # the queryset to delete from and the filter picking rows
+        self.queryset = getattr(options, 'queryset', None)
+        self.filter = getattr(options, 'filter', None)
+        self.model = getattr(options, 'model', None)
+
+        # the primary database, either an alias or a callable receiving (root, args, context, info)
+        self.using = getattr(options, 'using', None)
+        # reads of the model go to the primary for the rest of the request once deleted
+        self.sticky = getattr(options, 'sticky', True)
+
+        if self.queryset is None:
+            # get the queryset from the model
+            self.queryset = _get_queryset(self.model)
+
+        if self.model is None:
+            # a callable queryset requires the model to be declared
+            assert isinstance(self.queryset, QuerySet), 'the model is required'
+            self.model = self.queryset.model
+
+
 """
 Class to build dynamic getters able to handle multiple cases
 """
@@ -262,8 +971,22 @@ class FormMutationMeta(type):
         # get the meta class
         opts = new_class._meta = mcs.options_class(getattr(new_class, 'Meta', None))
 
+        if opts.concurrent_clean and not issubclass(opts.form_class, ConcurrentCleanMixinForm):
+            # derive the form to clean its fields concurrently
+            opts.form_class = type(opts.form_class.__name__, (ConcurrentCleanMixinForm, opts.form_class), {
+                '__module__': opts.form_class.__module__,
+                'clean_workers': opts.clean_workers,
+                'cpu_bound_fields': opts.cpu_bound_fields,
+            })
+
         # build the input class
-        new_class._input = type('Input', (object,), props(input_class) if input_class else {})
+        input_attrs = props(input_class) if input_class else {}
+
+        if opts.idempotency and opts.input_idempotency_key not in input_attrs:
+            # the key provided by clients
+            input_attrs[opts.input_idempotency_key] = graphene.String()
+
+        new_class._input = type('Input', (object,), input_attrs)
 
         # build the output attributes
         new_class._output_attrs = {
@@ -275,14 +998,27 @@ class FormMutationMeta(type):
         }
 
         # build the execute chain
-        execute_chain = lambda self, root, args, context, info: self._execute(root, args, context, info)
+        new_class._execute_chain = mcs.build_execute_chain(opts, '_execute')
 
-        for mw in reversed(opts.middlewares):
-            execute_chain = mw(execute_chain)
+        return new_class
 
-        new_class._execute_chain = execute_chain
+    @staticmethod
+    def build_execute_chain(opts, method_name):
+        if opts.asynchronous:
+            def execute_chain(self, root, args, context, info):
+                # forms are processed in the executor while middlewares may be coroutines
+                return self.run_async(getattr(self, method_name), root, args, context, info)
+
+            for mw in reversed(opts.middlewares):
+                execute_chain = ensure_async(mw(execute_chain))
+        else:
+            def execute_chain(self, root, args, context, info):
+                return getattr(self, method_name)(root, args, context, info)
 
-        return new_class
+            for mw in reversed(opts.middlewares):
+                execute_chain = mw(execute_chain)
+
+        return execute_chain
 
 
 """
@@ -303,19 +1039,75 @@ class ModelFormMutationMeta(FormMutationMeta):
         # get options
         opts = new_class._meta
 
+        if opts.batch_unique_checks and not issubclass(opts.form_class, BatchUniqueMixinForm):
+            # derive the form to merge its uniqueness checks
+            opts.form_class = type(opts.form_class.__name__, (BatchUniqueMixinForm, opts.form_class), {
+                '__module__': opts.form_class.__module__,
+            })
+
         if opts.filter is not None and not callable(opts.filter):
             # handle it ourselves
             opts.filter = ArgumentGetter(opts.filter)
 
+        if opts.prune_columns:
+            # compute columns to load once for all
+            opts.instance_fields = mcs.get_instance_fields(opts)
+
+        # bulk mutations go through middlewares as well (receiving lists of values as arguments)
+        new_class._bulk_execute_chain = mcs.build_execute_chain(opts, 'execute_bulk_guarded')
+
         # get output attributes
         output_attrs = new_class._output_attrs
 
         if opts.output_instance_key is not None:
             if opts.output_instance_key not in output_attrs:
-                # get the output type from the registry
-                output_type = opts.registry.get_type_for_model(opts.model)
-                # we have to handle it ourselves
-                output_attrs[opts.output_instance_key] = graphene.Field(output_type)
+                # we have to handle it ourselves, the output type is
+                # only taken from the registry when building the schema
+                output_attrs[opts.output_instance_key] = graphene.Field(
+                    lambda: opts.registry.get_type_for_model(opts.model)
+                )
+
+        return new_class
+
+    @staticmethod
+    def get_instance_fields(opts):
+        # the form fields (with exclusions applied)
+        names = set(opts.form_class.base_fields) | set(opts.required_fields)
+
+        return [
+            field.name for field in opts.model._meta.concrete_fields
+            # auto_now fields must be loaded to be saved
+            if field.primary_key or field.name in names or getattr(field, 'auto_now', False)
+        ]
+
+
+"""
+Meta class for delete mutation
+"""
+
+
+class DeleteMutationMeta(FormMutationMeta):
+    options_class = DeleteOptions
+
+    def __new__(mcs, name, bases, attrs):
+        if bases == (BaseDeleteMutation,):
+            return super(FormMutationMeta, mcs).__new__(mcs, name, bases, attrs)
+
+        # build the new class
+        new_class = super(DeleteMutationMeta, mcs).__new__(mcs, name, bases, attrs)
+
+        # get options
+        opts = new_class._meta
+
+        # never delete a whole table by mistake
+        assert opts.filter is not None, 'a filter is required'
+
+        if not callable(opts.filter):
+            # handle it ourselves
+            opts.filter = ArgumentGetter(opts.filter)
+
+        # provide the number of deleted rows
+        new_class._output_attrs.setdefault(opts.output_count_key, graphene.Int())
 
         return new_class
 
@@ -336,3 +1128,12 @@ Usable class for model form mutation
 
 class ModelFormMutation(six.with_metaclass(ModelFormMutationMeta, BaseModelFormMutation)):
     pass
+
+
+"""
+Usable class for delete mutation
+"""
+
+
+class DeleteMutation(six.with_metaclass(DeleteMutationMeta, BaseDeleteMutation)):
+    pass
@@ -0,0 +1,133 @@
+import re
+import warnings
+
+__all__ = ['UncoveredOrderingWarning', 'get_index_columns', 'get_uncovered_orderings', 'explain_pages']
+
+"""
+Check whether orderings are backed by database indexes
+"""
+
+
+class UncoveredOrderingWarning(UserWarning):
+    pass
+
+
+def get_index_columns(model):
+    opts = model._meta
+    # every index as a list of (field name, descending)
+    indexes = [[(opts.pk.name, False)]]
+
+    for field in opts.concrete_fields:
+        if field.db_index or field.unique:
+            indexes.append([(field.name, False)])
+
+    for index in opts.indexes:
+        if getattr(index, 'condition', None) is None:
+            # partial indexes cannot be relied on
+            indexes.append([(name.lstrip('-'), name.startswith('-')) for name in index.fields])
+
+    for fields in list(opts.unique_together) + list(opts.index_together):
+        indexes.append([(name, False) for name in fields])
+
+    for constraint in getattr(opts, 'constraints', []):
+        if getattr(constraint, 'fields', None) and getattr(constraint, 'condition', None) is None:
+            # unique constraints are backed by an index
+            indexes.append([(name, False) for name in constraint.fields])
+
+    return indexes
+
+
+def is_ordering_covered(model, ordering, indexes=None):
+    if indexes is None:
+        indexes = get_index_columns(model)
+
+    columns = []
+
+    for field in ordering:
+        name = field.lstrip('-')
+
+        if '__' in name:
+            # ordering on a related table cannot use our indexes
+            return False
+
+        # indexes know field names, not the pk alias
+        columns.append((model._meta.pk.name if name == 'pk' else name, field.startswith('-')))
+
+    for index in indexes:
+        if [name for name, descending in index[:len(columns)]] != [name for name, descending in columns]:
+            continue
+
+        # the index may be scanned forward or backward
+        directions = [a[1] == b[1] for a, b in zip(index, columns)]
+
+        if all(directions) or not any(directions):
+            return True
+
+    return False
+
+
+def get_uncovered_orderings(pager_class, model, warn=True):
+    indexes = get_index_columns(model)
+    uncovered = []
+
+    for name, field in pager_class._sort_fields.items():
+        if field.startswith('-'):
+            # backward scans use the same index
+            continue
+
+        if not is_ordering_covered(model, [field], indexes):
+            uncovered.append(field)
+
+            if warn:
+                warnings.warn(
+                    '%s sorts %s on %s which is not covered by any index' % (
+                        pager_class.__name__, model._meta.label, field,
+                    ),
+                    UncoveredOrderingWarning,
+                )
+
+    return uncovered
+
+
+"""
+Explain representative pages to spot sequential scans and sorts
+"""
+
+sequential_scan_patterns = [
+    # postgresql
+    re.compile(r'\bSeq Scan\b'),
+    # sqlite (scans without any index)
+    re.compile(r'\bSCAN (TABLE )?\w+\s*$', re.MULTILINE),
+    # mysql
+    re.compile(r'\tALL\t'),
+]
+
+sort_patterns = [
+    # postgresql
+    re.compile(r'\bSort\b'),
+    # sqlite
+    re.compile(r'TEMP B-TREE FOR ORDER BY'),
+    # mysql
+    re.compile(r'Using filesort'),
+]
+
+
+def explain_pages(pager_class, queryset, offsets=(0,), size=20, **options):
+    reports = []
+
+    for name, field in pager_class._sort_fields.items():
+        for offset in offsets:
+            # build the page the way the pager would
+            page = pager_class({'sort': [field], 'offset': offset, 'size': size}, queryset).qs
+            plan = page.explain(**options)
+
+            reports.append({
+                'sort': name,
+                'ordering': field,
+                'offset': offset,
+                'plan': plan,
+                'sequential_scan': any(pattern.search(plan) for pattern in sequential_scan_patterns),
+                'sort_node': any(pattern.search(plan) for pattern in sort_patterns),
+            })
+
+    return reports
@@ -0,0 +1,191 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack
+from django.db import connections
+
+__all__ = [
+    'Measure', 'record', 'get_snapshot', 'render_prometheus',
+    'add_listener', 'remove_listener', 'reset_stats',
+]
+
+"""
+In memory histograms of mutation phases
+"""
+
+# upper bounds of buckets (in seconds)
+buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram(object):
+    def __init__(self):
+        self.buckets = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+
+        for index, bound in enumerate(buckets):
+            if value <= bound:
+                # buckets are cumulative
+                self.buckets[index] += 1
+
+
+class PhaseStats(object):
+    def __init__(self):
+        # wall time of the phase
+        self.wall = Histogram()
+        # database activity
+        self.queries = 0
+        self.query_time = 0.0
+
+    def as_dict(self):
+        return {
+            'count': self.wall.count,
+            'wall_sum': self.wall.sum,
+            'wall_buckets': OrderedDict(zip(buckets, self.wall.buckets)),
+            'queries': self.queries,
+            'query_time': self.query_time,
+        }
+
+
+# stats by mutation and phase
+stats = OrderedDict()
+stats_lock = threading.Lock()
+
+# callbacks receiving every measure
+listeners = []
+
+
+def add_listener(listener):
+    listeners.append(listener)
+
+
+def remove_listener(listener):
+    listeners.remove(listener)
+
+
+def reset_stats():
+    with stats_lock:
+        stats.clear()
+
+
+def record(mutation, phase, wall, queries, query_time):
+    with stats_lock:
+        phase_stats = stats.get((mutation, phase), None)
+
+        if phase_stats is None:
+            phase_stats = stats[(mutation, phase)] = PhaseStats()
+
+        phase_stats.wall.observe(wall)
+        phase_stats.queries += queries
+        phase_stats.query_time += query_time
+
+    for listener in list(listeners):
+        listener(mutation=mutation, phase=phase, wall=wall, queries=queries, query_time=query_time)
+
+
+def get_snapshot():
+    with stats_lock:
+        return OrderedDict(
+            ('%s.%s' % key, phase_stats.as_dict())
+            for key, phase_stats in stats.items()
+        )
+
+
+"""
+Measure a phase
+"""
+
+
+class QueryCounter(object):
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.time += time.perf_counter() - start
+
+
+class Measure(object):
+    def __init__(self, mutation, phase):
+        self.mutation = mutation
+        self.phase = phase
+        self.counter = QueryCounter()
+        self.stack = ExitStack()
+        self.start = None
+
+    def __enter__(self):
+        for connection in connections.all():
+            # count queries on every database
+            self.stack.enter_context(connection.execute_wrapper(self.counter))
+
+        self.start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall = time.perf_counter() - self.start
+        self.stack.close()
+        record(self.mutation, self.phase, wall, self.counter.count, self.counter.time)
+
+
+class NoMeasure(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+no_measure = NoMeasure()
+
+
+"""
+Export stats in the Prometheus text format
+"""
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus(prefix='graphene_utils_mutation'):
+    lines = [
+        '# HELP %s_phase_seconds Wall time of mutation phases.' % prefix,
+        '# TYPE %s_phase_seconds histogram' % prefix,
+    ]
+
+    with stats_lock:
+        items = [(key, phase_stats.as_dict()) for key, phase_stats in stats.items()]
+
+    for (mutation, phase), values in items:
+        labels = 'mutation="%s",phase="%s"' % (escape_label(mutation), escape_label(phase))
+
+        for bound, count in values['wall_buckets'].items():
+            lines.append('%s_phase_seconds_bucket{%s,le="%s"} %d' % (prefix, labels, bound, count))
+
+        lines.append('%s_phase_seconds_bucket{%s,le="+Inf"} %d' % (prefix, labels, values['count']))
+        lines.append('%s_phase_seconds_sum{%s} %r' % (prefix, labels, values['wall_sum']))
+        lines.append('%s_phase_seconds_count{%s} %d' % (prefix, labels, values['count']))
+
+    for name, key, kind, help_text in (
+        ('phase_queries_total', 'queries', '%d', 'Database queries run by mutation phases.'),
+        ('phase_query_seconds_total', 'query_time', '%r', 'Time spent in database queries by mutation phases.'),
+    ):
+        lines.append('# HELP %s_%s %s' % (prefix, name, help_text))
+        lines.append('# TYPE %s_%s counter' % (prefix, name))
+
+        for (mutation, phase), values in items:
+            labels = 'mutation="%s",phase="%s"' % (escape_label(mutation), escape_label(phase))
+            lines.append(('%s_%s{%s} ' + kind) % (prefix, name, labels, values[key]))
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,110 @@
+from graphql.error import GraphQLError
+from graphql.execution.values import get_argument_values
+from .optimizer import get_selected_fields
+from .utils import get_objects_for_filters, get_request_cache
+
+__all__ = ['InstanceLoader', 'get_instance_loader', 'get_sibling_arguments']
+
+"""
+Freeze a filter so it may be used as a key
+"""
+
+
+def freeze_filter(filter):
+    return tuple(sorted(filter.items()))
+
+
+"""
+Load instances in batches and keep them in an identity map
+"""
+
+
+class InstanceLoader(object):
+    def __init__(self, queryset):
+        self.queryset = queryset
+        # the identity map (frozen filter to instance or None)
+        self.instances = {}
+
+    def __contains__(self, filter):
+        try:
+            return freeze_filter(filter) in self.instances
+        except TypeError:
+            # unhashable filters are never kept
+            return False
+
+    def load_many(self, filters):
+        # only fetch what we don't already know
+        filters = [filter for filter in filters if filter not in self]
+        instances = get_objects_for_filters(self.queryset, filters)
+
+        for filter, instance in zip(filters, instances):
+            try:
+                self.instances[freeze_filter(filter)] = instance
+            except TypeError:
+                # it will be fetched on its own
+                pass
+
+    def get(self, filter):
+        try:
+            key = freeze_filter(filter)
+        except TypeError:
+            # we cannot keep it
+            return self.queryset.get(**filter)
+
+        if key not in self.instances:
+            # fetch it now
+            self.load_many([filter])
+
+        instance = self.instances.get(key, None)
+
+        if instance is None:
+            # behave like queryset.get
+            model = self.queryset.model
+            raise model.DoesNotExist('%s matching query does not exist.' % model._meta.object_name)
+
+        return instance
+
+    def discard(self, instance):
+        # forget every entry leading to this instance
+        for key, value in list(self.instances.items()):
+            if value is instance:
+                del self.instances[key]
+
+
+def get_instance_loader(context, queryset):
+    loaders = get_request_cache(context, 'instance_loaders')
+
+    try:
+        # querysets with the same SQL share their identity map
+        key = (queryset.model, queryset.db, str(queryset.query))
+    except Exception:
+        # the query cannot be compiled ahead, don't share it
+        key = id(queryset)
+
+    if key not in loaders:
+        loaders[key] = InstanceLoader(queryset)
+
+    return loaders[key]
+
+
+"""
+Get arguments of every field of the operation resolved by the current field
+"""
+
+
+def get_sibling_arguments(info):
+    field_def = info.parent_type.fields[info.field_name]
+    siblings = []
+
+    for node in get_selected_fields([info.operation], info.fragments):
+        if node.name.value != info.field_name:
+            # another field
+            continue
+
+        try:
+            siblings.append(get_argument_values(field_def.args, node.arguments, info.variable_values))
+        except GraphQLError:
+            # it will fail on its own
+            pass
+
+    return siblings
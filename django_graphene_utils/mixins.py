@@ -17,3 +17,21 @@ class ReduceMixin(object):
         kwargs['reduce_to'] = (kwargs.get('data', None) or {}).keys()
 
         return kwargs
+
+    def get_instance_fields(self, root, args, context, info):
+        # get columns required by the whole form
+        fields = super(ReduceMixin, self).get_instance_fields(root, args, context, info)
+
+        if not fields:
+            # every column will be loaded anyway
+            return fields
+
+        # only keep the pushed ones
+        data = self.get_data(root, args, context, info) or {}
+        model_fields = [self._meta.model._meta.get_field(name) for name in fields]
+
+        return [
+            field.name for field in model_fields
+            if field.primary_key or field.name in data or field.name in self._meta.required_fields or
+            getattr(field, 'auto_now', False)
+        ]
@@ -0,0 +1,179 @@
+from collections import OrderedDict
+from django.db.models import Prefetch
+from graphene.utils.str_converters import to_snake_case
+from graphene_django.registry import get_global_registry
+from graphql.language.ast import FragmentSpread, InlineFragment
+
+__all__ = ['optimize_queryset', 'get_optimization', 'get_field_nodes']
+
+"""
+Walk through the selection set of a GraphQL query
+"""
+
+
+def get_selected_fields(nodes, fragments):
+    for node in nodes:
+        if node.selection_set is None:
+            # leaf field
+            continue
+
+        for selection in node.selection_set.selections:
+            if isinstance(selection, FragmentSpread):
+                # follow the fragment definition
+                yield from get_selected_fields([fragments[selection.name.value]], fragments)
+            elif isinstance(selection, InlineFragment):
+                # the inline fragment holds its own selection set
+                yield from get_selected_fields([selection], fragments)
+            else:
+                yield selection
+
+
+def get_field_nodes(info, path=()):
+    # start with the current field
+    nodes = info.field_asts
+
+    # and go deeper on the given graphql field names
+    for name in path:
+        nodes = [node for node in get_selected_fields(nodes, info.fragments) if node.name.value == name]
+
+    return nodes
+
+
+def get_model_fields(model):
+    fields = {}
+
+    for field in model._meta.get_fields():
+        if field.auto_created and not field.concrete:
+            # reverse relations are exposed through their accessor
+            name = field.get_accessor_name()
+
+            if name:
+                fields[name] = field
+        else:
+            fields[field.name] = field
+
+    return fields
+
+
+"""
+Optimizations to apply on a queryset
+"""
+
+
+class Optimization(object):
+    def __init__(self):
+        self.select_related = []
+        self.prefetch_related = []
+        # columns to load (none means all of them)
+        self.only = set()
+
+    def apply(self, queryset):
+        if self.select_related:
+            # join forward relations
+            queryset = queryset.select_related(*self.select_related)
+
+        if self.prefetch_related:
+            # and load the many sides in extra queries
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+
+        if self.only is not None:
+            # only load requested columns
+            queryset = queryset.only(*self.only)
+
+        return queryset
+
+
+def get_optimization(model, nodes, fragments, registry=None, prefix=''):
+    if registry is None:
+        registry = get_global_registry()
+
+    optimization = Optimization()
+    optimization.only.add(prefix + model._meta.pk.name)
+
+    # the type may provide custom resolvers
+    graphql_type = registry.get_type_for_model(model)
+    model_fields = get_model_fields(model)
+
+    # group nodes by field name to merge repeated fields
+    selections = OrderedDict()
+
+    for node in get_selected_fields(nodes, fragments):
+        selections.setdefault(node.name.value, []).append(node)
+
+    for name, field_nodes in selections.items():
+        if name == '__typename':
+            # nothing to load
+            continue
+
+        field_name = to_snake_case(name)
+        field = model_fields.get(field_name, None)
+
+        if field is model._meta.pk:
+            # always loaded
+            continue
+
+        if field is None or hasattr(graphql_type, 'resolve_%s' % field_name) or \
+                (field.is_relation and field.related_model is None):
+            # custom fields may require any column
+            optimization.only = None
+            continue
+
+        path = prefix + field_name
+
+        if not field.is_relation:
+            if optimization.only is not None:
+                optimization.only.add(path)
+        elif field.many_to_many or field.one_to_many:
+            # optimize the related queryset on its own
+            related = get_optimization(field.related_model, field_nodes, fragments, registry)
+
+            if related.only is not None and field.one_to_many:
+                if hasattr(field, 'object_id_field_name'):
+                    # generic relations dispatch items on both generic columns
+                    related.only.update((field.object_id_field_name, field.content_type_field_name))
+                else:
+                    # django needs the foreign key to dispatch prefetched items
+                    related.only.add(field.field.name)
+
+            queryset = related.apply(field.related_model._default_manager.all())
+            optimization.prefetch_related.append(Prefetch(path, queryset=queryset))
+        else:
+            # join single relations
+            optimization.select_related.append(path)
+            # and follow them on the same query
+            related = get_optimization(field.related_model, field_nodes, fragments, registry, path + '__')
+            optimization.select_related.extend(related.select_related)
+            optimization.prefetch_related.extend(related.prefetch_related)
+
+            if optimization.only is not None:
+                if related.only is None:
+                    # we cannot restrict the related columns
+                    optimization.only = None
+                else:
+                    optimization.only.update(related.only)
+
+                    if field.concrete:
+                        # keep the foreign key
+                        optimization.only.add(path)
+
+    return optimization
+
+
+def optimize_queryset(queryset, info, registry=None, path=(), extra_fields=(), only=True):
+    # get the nodes selecting our items
+    nodes = get_field_nodes(info, path)
+
+    if not nodes:
+        # nothing is selected
+        return queryset
+
+    optimization = get_optimization(queryset.model, nodes, info.fragments, registry)
+
+    if not only:
+        # load every column
+        optimization.only = None
+    elif optimization.only is not None:
+        # some columns are required anyway
+        optimization.only.update(extra_fields)
+
+    return optimization.apply(queryset)
@@ -1,34 +1,557 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
 import graphene
 from graphene.utils.str_converters import to_camel_case
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.db import connections
+from django.db.models import Count, Q, QuerySet, Window
 from django.utils import six
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+from .budget import QueryGuard
+from .caching import count, get_page_key, watch_model
+from .indexes import explain_pages, get_uncovered_orderings
+from .instrumentation import no_measure
+from .optimizer import optimize_queryset
+from .routing import get_alias, get_sticky_alias
+from .utils import get_or_create_type, resolve_path
 
 __all__ = ['Pager']
 
+"""
+Strategies to count items
+"""
+
+COUNT_EXACT = 'exact'
+COUNT_CAPPED = 'capped'
+COUNT_ESTIMATE = 'estimate'
+
+
+def get_count_strategy_enum():
+    # the enum is only built with the schema
+    return get_or_create_type('PagerCountStrategy', lambda: graphene.Enum('PagerCountStrategy', [
+        ('EXACT', COUNT_EXACT),
+        ('CAPPED', COUNT_CAPPED),
+        ('ESTIMATE', COUNT_ESTIMATE),
+    ]))
+
+
+# annotation holding the folded total count
+count_annotation = '_pager_total_count'
+
+# statistics queries to estimate the rows of a table
+estimate_queries = {
+    'postgresql': 'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+    'mysql': 'SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s',
+}
+
+"""
+Keyset helpers
+"""
+
+
+def reverse_ordering(field):
+    # swap the direction of a single ordering
+    return field[1:] if field.startswith('-') else '-%s' % field
+
+
+def is_nullable_path(model, path):
+    for key in path.split('__'):
+        try:
+            field = model._meta.pk if key == 'pk' else model._meta.get_field(key)
+        except FieldDoesNotExist:
+            # let the database complain about it
+            return False
+
+        if field.null:
+            # a step of the path may give NULL
+            return True
+
+        if not field.is_relation:
+            return False
+
+        model = field.related_model
+
+    return False
+
+
+def build_seek_filter(ordering, values, backward=False):
+    # expand the row comparison (a, b, pk) > (x, y, z) into
+    # (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND pk > z)
+    # so it works on every backend and with mixed directions
+    query = Q()
+    equals = {}
+
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+
+        if value is None:
+            # NULL cannot be compared (and backends sort it differently)
+            raise ValueError('invalid cursor')
+
+        # moving forward on an ascending field means greater values
+        lookup = 'lt' if field.startswith('-') != backward else 'gt'
+        query |= Q(**dict(equals, **{'%s__%s' % (name, lookup): value}))
+        # next fields only matter when this one is equal
+        equals[name] = value
+
+    return query
+
+
+"""
+Encode cursor values without losing precision
+"""
+
+# tags of values json cannot hold as is
+cursor_types = [
+    # datetime must come before date as it's a subclass
+    ('dt', datetime.datetime, lambda value: value.isoformat(), parse_datetime),
+    ('d', datetime.date, lambda value: value.isoformat(), parse_date),
+    ('t', datetime.time, lambda value: value.isoformat(), parse_time),
+    ('td', datetime.timedelta, lambda value: [value.days, value.seconds, value.microseconds],
+     lambda value: datetime.timedelta(*value)),
+    ('dec', decimal.Decimal, str, decimal.Decimal),
+    ('uuid', uuid.UUID, str, uuid.UUID),
+]
+
+
+def encode_cursor_value(value):
+    for tag, value_type, encode, decode in cursor_types:
+        if isinstance(value, value_type):
+            # tagged values are the only lists in cursors
+            return [tag, encode(value)]
+
+    if value is not None and not isinstance(value, (str, int, float, bool)):
+        raise TypeError('cannot use %r in a cursor' % value)
+
+    return value
+
+
+def decode_cursor_value(value):
+    if not isinstance(value, list):
+        return value
+
+    for tag, value_type, encode, decode in cursor_types:
+        if len(value) == 2 and value[0] == tag:
+            decoded = decode(value[1])
+
+            if decoded is None:
+                # the parser didn't recognize it
+                break
+
+            return decoded
+
+    raise ValueError('invalid cursor')
+
+
+"""
+Options/settings for pager
+"""
+
+
+class PagerOptions(object):
+    def __init__(self, options=None):
+        # use keyset (cursor) pagination instead of limit/offset
+        self.keyset = getattr(options, 'keyset', False)
+
+        # the default strategy to count items (none by default)
+        self.count = getattr(options, 'count', None)
+        # the limit for capped counts
+        self.count_cap = getattr(options, 'count_cap', 10000)
+
+        # stream items when getting all of them
+        self.stream = getattr(options, 'stream', False)
+        # the number of rows fetched at once while streaming
+        self.chunk_size = getattr(options, 'chunk_size', 2000)
+        # the hard limit of rows when getting all items
+        self.max_rows = getattr(options, 'max_rows', None)
+
+        # optimize the queryset based on the GraphQL selection set
+        self.optimize = getattr(options, 'optimize', False)
+        # graphql field names leading to the items from the paginated field
+        self.optimize_path = getattr(options, 'optimize_path', ())
+        # the registry (the global one by default)
+        self.registry = getattr(options, 'registry', None)
+
+        # the model paginated (required to check indexes)
+        self.model = getattr(options, 'model', None)
+        # warn about sort fields not covered by an index when creating the class
+        self.check_indexes = getattr(options, 'check_indexes', False)
+
+        # the maximum number of queries to get a page (see BasePager.guard to check resolved fields as well)
+        self.max_queries = getattr(options, 'max_queries', None)
+        # the maximum number of times the same query may run (such as prefetches run per item)
+        self.max_repeated_queries = getattr(options, 'max_repeated_queries', None)
+        # either warn or raise when going over budget
+        self.query_budget_action = getattr(options, 'query_budget_action', 'warn')
+
+        # the alias of the django cache holding pages (none to disable it)
+        self.cache = getattr(options, 'cache', None)
+        # how long a page is kept (in seconds)
+        self.cache_timeout = getattr(options, 'cache_timeout', 60)
+        # larger pages are not cached
+        self.cache_max_items = getattr(options, 'cache_max_items', 1000)
+
+        # the database to read from, either an alias or a callable receiving (root, data, context, info)
+        self.using = getattr(options, 'using', None)
+        # read from the database a model got written to earlier in the request
+        self.sticky = getattr(options, 'sticky', True)
+
+        if self.cache is not None and self.model is not None:
+            # changes must invalidate pages even before this process read any
+            watch_model(self.model, self.cache)
+
+
+"""
+Iterate over rows chunk by chunk
+"""
+
+
+class StreamedQuerySet(object):
+    # not a generator on its own, promise would take it for a coroutine and wait on it forever
+    def __init__(self, queryset, chunk_size):
+        self.queryset = queryset
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        for item in self.queryset.iterator(chunk_size=self.chunk_size):
+            yield item
+
 
 class BasePager(object):
-    def __init__(self, data, queryset, default_size=20):
-        # process data
-        self.qs = self._process_data(data or {}, queryset, default_size)
+    def __init__(self, data, queryset, default_size=20, info=None, root=None, context=None):
+        # the resolve info (required to optimize the queryset)
+        self.info = info
+        # the parent object and the request context (used to route queries)
+        self.root = root
+        self.context = context
+        # the ordering used for cursors (keyset mode only)
+        self.ordering = None
+        # the strategy to count items may be picked by the request
+        self.count_strategy = (data or {}).get('count', None) or self._meta.count
+        # the unpaginated queryset and whether the count got folded into the page
+        self.count_queryset = None
+        self.count_folded = False
+        self._total_count = None
+
+        if self._meta.max_queries is None and self._meta.max_repeated_queries is None:
+            # process data
+            self.qs = self._process_data(data or {}, queryset, default_size)
+        else:
+            with self.guard():
+                self.qs = self._process_data(data or {}, queryset, default_size)
+
+                if isinstance(self.qs, QuerySet):
+                    # evaluate the page (and its prefetches) within the budget
+                    len(self.qs)
+
+    @classmethod
+    def guard(cls):
+        # the pager only checks queries loading the page, fields of the items are resolved
+        # once the resolver returned: wrap the execution of the schema to catch those N+1 patterns
+        if cls._meta.max_queries is None and cls._meta.max_repeated_queries is None:
+            # no budget to enforce
+            return no_measure
+
+        return QueryGuard(
+            cls.__name__,
+            max_queries=cls._meta.max_queries,
+            max_repeats=cls._meta.max_repeated_queries,
+            action=cls._meta.query_budget_action,
+        )
 
     def _process_data(self, data, queryset, default_size):
+        using = self.get_using(data, queryset)
+
+        if using is not None:
+            # read from another database (a replica)
+            queryset = queryset.using(using)
+
+        if self._meta.optimize and self.info is not None:
+            # load requested relations and columns only
+            queryset = self._optimize(queryset)
+
         # we may have to handle sorting fields
-        if self._sort_fields:
-            # check if we've some
-            sort_fields = data.get('sort', None)
+        queryset = self.sort_queryset(queryset, data.get('sort', None))
 
-            if sort_fields:
-                # so order the queryset
-                queryset = queryset.order_by(*sort_fields)
+        # keep the unpaginated queryset to count items
+        self.count_queryset = queryset
 
         # we maye have to get all items
         if data.get('all', False):
+            if self._meta.max_rows is not None:
+                # never go beyond the hard limit
+                queryset = queryset[:self._meta.max_rows]
+
+            if self._meta.stream:
+                # walk through the rows chunk by chunk (using server side
+                # cursors where supported) instead of loading all of them
+                return StreamedQuerySet(queryset, self._meta.chunk_size)
+
             # no need to paginate it
             return queryset
 
+        if self._meta.cache is not None:
+            # pages may come from the cache
+            return self._process_cached(data, queryset, default_size)
+
+        return self._paginate(data, queryset, default_size)
+
+    def get_using(self, data, queryset):
+        if self._meta.sticky:
+            # the model may have been written in this request
+            using = get_sticky_alias(self.context, queryset.model)
+
+            if using is not None:
+                return using
+
+        return get_alias(self._meta.using, self.root, data, self.context, self.info)
+
+    @classmethod
+    def sort_queryset(cls, queryset, sort_fields):
+        # we may have to handle sorting fields
+        if cls._sort_fields and sort_fields:
+            # so order the queryset
+            queryset = queryset.order_by(*sort_fields)
+
+        return queryset
+
+    def _paginate(self, data, queryset, default_size):
+        if self._meta.keyset:
+            # seek instead of skipping rows
+            return self._process_keyset(data, queryset, default_size)
+
         # get the offset (0 by default)
         offset = data.get('offset', 0)
         # final queryset
-        return queryset[offset:offset + data.get('size', default_size)]
+        return self._fold_count(queryset)[offset:offset + data.get('size', default_size)]
+
+    def _optimize(self, queryset):
+        # sorting fields must be loaded to build cursors
+        extra_fields = [field.lstrip('-') for field in self._sort_fields.values()]
+        extra_fields.extend(field.lstrip('-') for field in queryset.model._meta.ordering if isinstance(field, str))
+
+        return optimize_queryset(
+            queryset, self.info,
+            registry=self._meta.registry,
+            path=self._meta.optimize_path,
+            extra_fields=extra_fields,
+            # columns of relations cannot be kept without joining them
+            only=not any('__' in field for field in extra_fields),
+        )
+
+    def _process_cached(self, data, queryset, default_size):
+        cache = caches[self._meta.cache]
+        # changes on the model will invalidate pages
+        watch_model(queryset.model, self._meta.cache)
+
+        try:
+            key = get_page_key(cache, queryset, dict(data, size=data.get('size', default_size)))
+        except EmptyResultSet:
+            # nothing will match anyway
+            return self._paginate(data, queryset, default_size)
+
+        entry = cache.get(key, None)
+
+        if entry is not None:
+            count('hits')
+            pks, total_count = entry
+
+            if total_count is not None:
+                # the count has been cached along the page
+                self._total_count = (total_count, True)
+
+            if self._meta.keyset:
+                # cursors require the ordering
+                queryset = queryset.order_by(*self._get_keyset_ordering(queryset))
+
+            # the ordering of the queryset restores the page order
+            return queryset.filter(pk__in=pks)
+
+        count('misses')
+        page = self._paginate(data, queryset, default_size)
+        # evaluate it right now to remember its content
+        items = list(page)
+
+        if len(items) <= self._meta.cache_max_items:
+            total_count = getattr(items[0], count_annotation) if items and self.count_folded else None
+            cache.set(key, ([item.pk for item in items], total_count), self._meta.cache_timeout)
+
+        return page
+
+    def _fold_count(self, queryset):
+        if self.count_strategy != COUNT_EXACT:
+            # nothing to fold
+            return queryset
+
+        if queryset.query.distinct or queryset.query.combinator:
+            # windows are evaluated before DISTINCT (and per part of a union), count on its own
+            return queryset
+
+        # COUNT(*) OVER() gives the total on every row of the page
+        self.count_folded = True
+
+        return queryset.annotate(**{count_annotation: Window(expression=Count('*'))})
+
+    def _get_keyset_ordering(self, queryset):
+        # start from the current ordering
+        ordering = list(queryset.query.order_by)
+
+        if not ordering and queryset.query.default_ordering:
+            # fallback on the model ordering
+            ordering = list(queryset.model._meta.ordering)
+
+        if not all(isinstance(field, str) for field in ordering):
+            raise ValueError('keyset pagination only supports ordering on field names')
+
+        for field in ordering:
+            if is_nullable_path(queryset.model, field.lstrip('-')):
+                raise ValueError('keyset pagination does not support ordering on the nullable %s' % field.lstrip('-'))
+
+        if 'pk' not in [field.lstrip('-') for field in ordering]:
+            # the primary key makes the ordering total
+            ordering.append('pk')
+
+        self.ordering = ordering
+
+        return ordering
+
+    def _process_keyset(self, data, queryset, default_size):
+        ordering = self._get_keyset_ordering(queryset)
+        size = data.get('size', default_size)
+        before = data.get('before', None)
+
+        if before:
+            # walk backward from the cursor
+            queryset = queryset.filter(build_seek_filter(ordering, self.decode_cursor(before), backward=True))
+            queryset = queryset.order_by(*[reverse_ordering(field) for field in ordering])[:size]
+            # then restore the expected order
+            return list(reversed(queryset))
+
+        queryset = queryset.order_by(*ordering)
+        after = data.get('after', None)
+
+        if after:
+            # seek right after the cursor
+            return queryset.filter(build_seek_filter(ordering, self.decode_cursor(after)))[:size]
+
+        # get the offset (0 by default)
+        offset = data.get('offset', 0)
+        # first page
+        return self._fold_count(queryset)[offset:offset + size]
+
+    def decode_cursor(self, cursor):
+        try:
+            # cursors are url safe base64 json lists
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        except (binascii.Error, UnicodeError, ValueError):
+            raise ValueError('invalid cursor')
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            # the cursor was made for another ordering
+            raise ValueError('invalid cursor')
+
+        try:
+            return [decode_cursor_value(value) for value in values]
+        except (TypeError, ArithmeticError):
+            # broken tagged values
+            raise ValueError('invalid cursor')
+
+    def get_cursor(self, instance):
+        # ensure we're paginating on keys
+        assert self.ordering is not None, 'cursors are only available in keyset mode'
+        # pick the values of the sorting keys
+        values = [encode_cursor_value(resolve_path(instance, field.lstrip('-'))) for field in self.ordering]
+
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    @property
+    def start_cursor(self):
+        items = list(self.qs)
+
+        return self.get_cursor(items[0]) if items else None
+
+    @property
+    def end_cursor(self):
+        items = list(self.qs)
+
+        return self.get_cursor(items[-1]) if items else None
+
+    @property
+    def total_count(self):
+        if self._total_count is None:
+            # count only once
+            self._total_count = self.get_total_count()
+
+        return self._total_count[0]
+
+    @property
+    def total_count_is_exact(self):
+        # ensure we counted first
+        self.total_count
+
+        return self._total_count[1]
+
+    def get_total_count(self):
+        if self.count_strategy == COUNT_CAPPED:
+            return self._get_capped_count()
+
+        if self.count_strategy == COUNT_ESTIMATE:
+            return self._get_estimated_count()
+
+        if self.count_folded:
+            items = list(self.qs)
+
+            if items:
+                # the page already holds it
+                return getattr(items[0], count_annotation), True
+
+        # a separate query is required
+        return self.count_queryset.count(), True
+
+    def _get_capped_count(self):
+        cap = self._meta.count_cap
+        # stop scanning right after the cap
+        count = self.count_queryset[:cap + 1].count()
+
+        if count > cap:
+            return cap, False
+
+        return count, True
+
+    def _get_estimated_count(self):
+        queryset = self.count_queryset
+        query = estimate_queries.get(connections[queryset.db].vendor, None)
+
+        if query is None or queryset.query.where:
+            # statistics are only relevant for the whole table
+            return self._get_capped_count()
+
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(query, [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+
+        if not row or row[0] is None or row[0] < 0:
+            # the table has not been analyzed yet
+            return self._get_capped_count()
+
+        return int(row[0]), False
+
+    @classmethod
+    def get_uncovered_orderings(cls, model=None, warn=True):
+        model = model or cls._meta.model
+        assert model is not None, 'a model is required to check indexes'
+
+        return get_uncovered_orderings(cls, model, warn=warn)
+
+    @classmethod
+    def explain(cls, queryset, offsets=(0,), size=20, **options):
+        # explain a page for every sort field
+        return explain_pages(cls, queryset, offsets=offsets, size=size, **options)
 
     @classmethod
     def to_input(cls, input_name, graphql_type=graphene.InputObjectType, enum_name=None):
@@ -39,12 +562,21 @@ class BasePager(object):
             'all': graphene.Boolean()
         }
 
+        if cls._meta.keyset:
+            # the cursors to seek from
+            attrs['after'] = graphene.String()
+            attrs['before'] = graphene.String()
+
+        if cls._meta.count:
+            # the request may pick another strategy
+            attrs['count'] = get_count_strategy_enum()()
+
         # we might have to support sorting
         if cls._sort_fields:
             # first ensure we have a name
             if enum_name is None:
                 # made it from the input name
-                enum_name = '%SortField' % input_name
+                enum_name = '%sSortField' % input_name
 
             # then build the enum for this input
             sort_enum = graphene.Enum(enum_name, list(cls._sort_fields.items()))
@@ -56,6 +588,8 @@ class BasePager(object):
 
 
 class PagerMeta(type):
+    options_class = PagerOptions
+
     def __new__(mcs, name, bases, attrs):
         # build the new class
         new_method = super(PagerMeta, mcs).__new__
@@ -82,9 +616,16 @@ class PagerMeta(type):
         # create the new class
         new_cls = new_method(mcs, name, bases, attrs)
 
+        # get the options
+        new_cls._meta = mcs.options_class(getattr(new_cls, 'Meta', None))
+
         # then add fields
         new_cls._sort_fields = fields
 
+        if new_cls._meta.check_indexes and new_cls._meta.model is not None:
+            # warn about orderings requiring a full sort
+            new_cls.get_uncovered_orderings()
+
         return new_cls
 
 
@@ -0,0 +1,32 @@
+from .utils import get_request_cache
+
+__all__ = ['get_alias', 'stick_to_database', 'get_sticky_alias']
+
+"""
+Pick the database of a query from a static alias or a callable
+"""
+
+
+def get_alias(using, root, args, context, info):
+    if callable(using):
+        # the policy depends on the request
+        return using(root, args, context, info)
+
+    return using
+
+
+"""
+Read your writes: once a model got written, the rest of the request reads it from the same database
+"""
+
+
+def stick_to_database(context, model, alias):
+    if context is not None:
+        get_request_cache(context, 'sticky')[model] = alias
+
+
+def get_sticky_alias(context, model):
+    if context is None:
+        return None
+
+    return get_request_cache(context, 'sticky').get(model, None)
@@ -0,0 +1,175 @@
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import connections, router
+from django.db.models import Q
+
+__all__ = ['BatchUniqueMixinForm', 'validate_unique_batch']
+
+"""
+Gather uniqueness checks of model instances
+"""
+
+
+class UniqueLookup(object):
+    def __init__(self, instance, model_class, unique_check, values):
+        self.instance = instance
+        self.model_class = model_class
+        self.unique_check = unique_check
+        # values by attribute name
+        self.values = values
+        # the row to ignore (the instance being updated)
+        self.exclude = None if instance._state.adding else instance._get_pk_val(model_class._meta)
+
+    @property
+    def key(self):
+        # errors on a single field are reported on that field
+        return self.unique_check[0] if len(self.unique_check) == 1 else NON_FIELD_ERRORS
+
+    @property
+    def query(self):
+        query = Q(**self.values)
+
+        if self.exclude is not None:
+            query &= ~Q(pk=self.exclude)
+
+        return query
+
+    def matches(self, row):
+        return row['pk'] != self.exclude and all(row[name] == value for name, value in self.values.items())
+
+    def get_error(self):
+        return self.instance.unique_error_message(self.model_class, self.unique_check)
+
+
+def get_unique_lookups(instance, exclude=None):
+    unique_checks, date_checks = instance._get_unique_checks(exclude=exclude)
+    # follow the rules of Model._perform_unique_checks
+    empty_is_null = connections[router.db_for_read(instance.__class__)].features.interprets_empty_strings_as_nulls
+    lookups = []
+
+    for model_class, unique_check in unique_checks:
+        values = {}
+
+        for name in unique_check:
+            field = instance._meta.get_field(name)
+            value = getattr(instance, field.attname)
+
+            if value is None or (value == '' and empty_is_null):
+                # no value, no conflict
+                break
+
+            if field.primary_key and not instance._state.adding:
+                # no need to check it when editing
+                break
+
+            values[field.attname] = value
+        else:
+            lookups.append(UniqueLookup(instance, model_class, unique_check, values))
+
+    return lookups, date_checks
+
+
+"""
+Run many uniqueness checks with a single query per model
+"""
+
+
+def find_conflicts(lookups):
+    conflicts = set()
+    by_model = OrderedDict()
+
+    for lookup in lookups:
+        by_model.setdefault(lookup.model_class, []).append(lookup)
+
+    for model_class, model_lookups in by_model.items():
+        names = set(name for lookup in model_lookups for name in lookup.values)
+        rows = list(
+            model_class._default_manager
+            .filter(reduce(or_, (lookup.query for lookup in model_lookups)))
+            .values('pk', *names)
+        )
+        unexplained = False
+
+        for row in rows:
+            matching = [lookup for lookup in model_lookups if lookup.matches(row)]
+            conflicts.update(matching)
+
+            if not matching:
+                # the database compares values another way (collations, etc.)
+                unexplained = True
+
+        if unexplained:
+            # ask the database about each check we couldn't match
+            for lookup in model_lookups:
+                if lookup not in conflicts and model_class._default_manager.filter(lookup.query).exists():
+                    conflicts.add(lookup)
+
+    return conflicts
+
+
+def get_batch_duplicates(lookups):
+    duplicates = set()
+    seen = set()
+
+    for lookup in lookups:
+        key = (lookup.model_class, lookup.unique_check, tuple(sorted(lookup.values.items())))
+
+        if key in seen:
+            # an earlier item of the batch already claims these values
+            duplicates.add(lookup)
+
+        seen.add(key)
+
+    return duplicates
+
+
+"""
+Form mixin running uniqueness checks in a single query
+"""
+
+
+class BatchUniqueMixinForm(object):
+    # checks are postponed to validate the whole batch at once
+    defer_unique_checks = False
+
+    def validate_unique(self):
+        lookups, date_checks = get_unique_lookups(self.instance, self._get_validation_exclusions())
+
+        if self.defer_unique_checks:
+            # keep them for validate_unique_batch
+            self.unique_lookups = lookups
+            conflicts = set()
+        else:
+            conflicts = find_conflicts(lookups) if lookups else set()
+
+        # date checks are rare enough to keep the default behavior
+        errors = self.instance._perform_date_checks(date_checks)
+
+        for lookup in lookups:
+            if lookup in conflicts:
+                errors.setdefault(lookup.key, []).append(lookup.get_error())
+
+        if errors:
+            self._update_errors(ValidationError(errors))
+
+
+def validate_unique_batch(forms):
+    lookups = [lookup for form in forms for lookup in getattr(form, 'unique_lookups', [])]
+
+    if not lookups:
+        return
+
+    # conflicts with the database and within the batch itself
+    conflicts = find_conflicts(lookups) | get_batch_duplicates(lookups)
+
+    for form in forms:
+        errors = {}
+
+        for lookup in getattr(form, 'unique_lookups', []):
+            if lookup in conflicts:
+                errors.setdefault(lookup.key, []).append(lookup.get_error())
+
+        if errors:
+            form._update_errors(ValidationError(errors))
@@ -1,21 +1,59 @@
 from collections import OrderedDict
+from functools import reduce
+from operator import or_
 import graphene
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Model, Q
 from django.utils.encoding import force_text
 from django.shortcuts import _get_queryset
 from graphene import AbstractType, InputObjectType
 from graphene.utils.str_converters import to_camel_case
 from graphene_django import form_converter
 from graphene_django.converter import get_choices
-from graphene_django.filter.utils import get_filtering_args_from_filterset
-from .forms import ReduceMixinForm
 from .types import FormError
 
 __all__ = [
     'convert_filterset', 'convert_form', 'convert_form_errors',
-    'get_object_or_none', 'get_enum_from_field',
-    'get_enum_from_choices',
+    'get_object_or_none', 'get_objects_or_none', 'get_enum_from_field',
+    'get_enum_from_choices', 'clear_type_registry',
 ]
 
+"""
+Registry of converted types, so the same inputs always give the same type
+"""
+
+type_registry = {}
+
+
+def freeze(value):
+    if isinstance(value, (list, tuple)):
+        # nested choices are lists of lists
+        return tuple(freeze(item) for item in value)
+
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+
+    return value
+
+
+def get_or_create_type(key, factory):
+    try:
+        return type_registry[key]
+    except KeyError:
+        # build it once
+        value = type_registry[key] = factory()
+
+        return value
+    except TypeError:
+        # we cannot remember unhashable inputs
+        return factory()
+
+
+def clear_type_registry():
+    type_registry.clear()
+
+
 """
 Convert filter set into graphql type
 +
@@ -23,6 +61,16 @@ Convert filter set into graphql type
 
 
 def convert_filterset(filterset_class, name=None, graphql_type=AbstractType):
+    return get_or_create_type(
+        ('filterset', filterset_class, name, graphql_type),
+        lambda: build_filterset_type(filterset_class, name, graphql_type),
+    )
+
+
+def build_filterset_type(filterset_class, name, graphql_type):
+    # django-filter is only imported when required
+    from graphene_django.filter.utils import get_filtering_args_from_filterset
+
     return type(
         # use the filter set name to define the type name
         name or to_camel_case('{}_{}'.format(filterset_class.__name__, 'Type')),
@@ -53,6 +101,13 @@ def convert_form(form_class, name=None, graphql_type=InputObjectType, all_option
     if exclude_fields is None:
         exclude_fields = []
 
+    return get_or_create_type(
+        ('form', form_class, name, graphql_type, all_optional, freeze(exclude_fields)),
+        lambda: build_form_type(form_class, name, graphql_type, all_optional, exclude_fields),
+    )
+
+
+def build_form_type(form_class, name, graphql_type, all_optional, exclude_fields):
     return type(
         # use the form name to define the input type name
         name or to_camel_case('{}_{}'.format(form_class, 'input')),
@@ -104,12 +159,71 @@ def get_object_or_none(klass, *args, **kwargs):
         return None
 
 
+"""
+Batch companion of get_object_or_none
+"""
+
+
+def get_objects_or_none(klass, ids, field_name='pk', context=None, batch_size=None):
+    # first get the queryset
+    queryset = _get_queryset(klass)
+
+    if not hasattr(queryset, 'in_bulk'):
+        # we got wrong arguments
+        klass__name = klass.__name__ if isinstance(klass, type) else klass.__class__.__name__
+        raise ValueError(
+            "First argument to get_objects_or_none() must be a Model, Manager, "
+            "or QuerySet, not '%s'." % klass__name
+        )
+
+    field = queryset.model._meta.pk if field_name == 'pk' else queryset.model._meta.get_field(field_name)
+
+    if not field.unique:
+        # follow the rules of in_bulk
+        raise ValueError("get_objects_or_none()'s field_name must be a unique field but %r isn't." % field_name)
+
+    keys = []
+
+    for value in ids:
+        try:
+            # normalize the values the way the database would
+            keys.append(normalize_value(field, value))
+        except ValidationError:
+            # it cannot match anything
+            keys.append(None)
+
+    try:
+        # the same objects are shared by the whole request
+        objects = get_request_cache(context, 'objects').setdefault(
+            (queryset.model, queryset.db, str(queryset.query), field_name), {}
+        ) if context is not None else {}
+    except EmptyResultSet:
+        # nothing will ever match
+        return [None] * len(keys)
+
+    missing = list(OrderedDict.fromkeys(key for key in keys if key is not None and key not in objects))
+    found = get_objects_for_filters(queryset, [{field_name: key} for key in missing], batch_size)
+
+    for key, instance in zip(missing, found):
+        # misses are remembered as well
+        objects[key] = instance
+
+    return [objects.get(key, None) if key is not None else None for key in keys]
+
+
 """
 Extract the enum for a given field on a model
 """
 
 
 def get_enum_from_field(model, field_name, enum_name=None):
+    return get_or_create_type(
+        ('field', model, field_name, enum_name),
+        lambda: build_enum_from_field(model, field_name, enum_name),
+    )
+
+
+def build_enum_from_field(model, field_name, enum_name):
     # first get the field
     field = model._meta.get_field(field_name)
     # then get the choices
@@ -130,6 +244,20 @@ def get_enum_from_field(model, field_name, enum_name=None):
 
 
 def get_enum_from_choices(choices, enum_name, required_by_default=True, help_text=''):
+    # get the enum type
+    enum = get_or_create_type(
+        ('choices', enum_name, freeze(choices)),
+        lambda: build_enum_from_choices(choices, enum_name),
+    )
+
+    # make it way easier to convert it for us
+    def apply(required=required_by_default):
+        return enum(description=help_text, required=required)
+
+    return apply
+
+
+def build_enum_from_choices(choices, enum_name):
     choices = list(get_choices(choices))
     named_choices = [(c[0], c[1]) for c in choices]
     named_choices_descriptions = {c[0]: c[2] for c in choices}
@@ -139,11 +267,174 @@ def get_enum_from_choices(choices, enum_name, required_by_default=True, help_tex
         def description(self):
             return named_choices_descriptions[self.name]
 
-    # get the enum type
-    enum = graphene.Enum(enum_name, list(named_choices), type=EnumWithDescriptionsType)
+    return graphene.Enum(enum_name, list(named_choices), type=EnumWithDescriptionsType)
 
-    # make it way easier to convert it for us
-    def apply(required=required_by_default):
-        return enum(description=help_text, required=required)
 
-    return apply
+"""
+Resolve a django lookup path (such as author__name) on an instance
+"""
+
+
+def resolve_path(instance, path):
+    value = instance
+
+    # follow each step of the path
+    for key in path.split('__'):
+        if value is None:
+            # we cannot go further
+            return None
+
+        value = getattr(value, key)
+
+    if isinstance(value, Model):
+        # orderings on relations end up on the primary key
+        return value.pk
+
+    return value
+
+
+"""
+Resolve the model field targeted by a django lookup path
+"""
+
+
+def get_field_from_path(model, path):
+    field = None
+
+    for key in path.split('__'):
+        if model is None:
+            # we cannot go further
+            return None
+
+        try:
+            field = model._meta.pk if key == 'pk' else model._meta.get_field(key)
+        except FieldDoesNotExist:
+            # it might be a lookup (such as iexact)
+            return None
+
+        if not field.concrete or field.many_to_many:
+            # only single valued fields can be matched back
+            return None
+
+        model = field.related_model
+
+    return field
+
+
+"""
+Get the objects matching a list of filters using as few queries as possible
+"""
+
+
+def normalize_value(field, value):
+    if isinstance(value, Model):
+        # relations are matched on their primary key
+        value = value.pk
+
+    return field.to_python(value) if value is not None else None
+
+
+def resolve_column(instance, path, field):
+    value = instance
+
+    # relations along the path have been joined
+    for key in path.split('__')[:-1]:
+        if value is None:
+            # we cannot go further
+            return None
+
+        value = getattr(value, key)
+
+    # read the column itself so the last relation never gets loaded
+    return getattr(value, field.attname) if value is not None else None
+
+
+def get_objects_for_filters(queryset, filters, batch_size=None):
+    results = [None] * len(filters)
+    # group filters sharing the same keys
+    shapes = OrderedDict()
+
+    for index, filter in enumerate(filters):
+        if filter:
+            shapes.setdefault(tuple(sorted(filter)), []).append(index)
+
+    if batch_size is None:
+        # stay below the limit of parameters of the database
+        batch_size = connections[queryset.db].features.max_query_params or 2000
+
+    for shape, indexes in shapes.items():
+        fields = [get_field_from_path(queryset.model, path) for path in shape]
+
+        if None in fields:
+            # we cannot match objects back to their filters, go one by one
+            for index in indexes:
+                results[index] = get_object_or_none(queryset, **filters[index])
+
+            continue
+
+        keys = OrderedDict()
+
+        for index in indexes:
+            try:
+                # normalize the values the way the database would
+                key = tuple(normalize_value(field, filters[index][path]) for field, path in zip(fields, shape))
+            except ValidationError:
+                # it cannot match anything
+                continue
+
+            if None not in key:
+                keys.setdefault(key, []).append(index)
+
+        # join relations we've to follow
+        related = [path.rsplit('__', 1)[0] for path in shape if '__' in path]
+        # each filter takes a parameter per key
+        pending = list(keys)
+        chunk_size = max(batch_size // len(shape), 1)
+
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+
+            if len(shape) == 1:
+                # a single IN clause
+                condition = Q(**{'%s__in' % shape[0]: [key[0] for key in chunk]})
+            else:
+                condition = reduce(or_, (Q(**dict(zip(shape, key))) for key in chunk))
+
+            matches = queryset.filter(condition)
+
+            if related:
+                matches = matches.select_related(*related)
+
+            for instance in matches:
+                key = tuple(resolve_column(instance, path, field) for field, path in zip(fields, shape))
+
+                for index in keys.get(key, ()):
+                    results[index] = instance
+
+    return results
+
+
+"""
+Get a cache living as long as the request (the GraphQL context)
+"""
+
+
+def get_request_cache(context, name):
+    key = '_graphene_utils_%s' % name
+
+    if isinstance(context, dict):
+        # the context is a plain dictionary
+        return context.setdefault(key, {})
+
+    cache = getattr(context, key, None)
+
+    if cache is None:
+        cache = {}
+
+        try:
+            setattr(context, key, cache)
+        except AttributeError:
+            # we cannot keep it on this context (or there's no context at all)
+            pass
+
+    return cache
@@ -0,0 +1,142 @@
+import csv
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, StreamingHttpResponse
+from django.views.generic import View
+
+__all__ = ['PagerExportView']
+
+"""
+Stream the items of a pager as NDJSON or CSV
+"""
+
+
+class Echo(object):
+    # csv writers write into it and we get the line back
+    def write(self, value):
+        return value
+
+
+content_types = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class PagerExportView(View):
+    # the pager providing sort fields and limits
+    pager_class = None
+    # the queryset to export (get_queryset may be overridden)
+    queryset = None
+    # columns to export (required, never leak columns by default)
+    fields = None
+    # the format used when the request doesn't ask for one
+    default_format = 'ndjson'
+    # the name of the downloaded file (without extension)
+    filename = None
+
+    def get_queryset(self, request):
+        assert self.queryset is not None, 'a queryset is required'
+
+        return self.queryset.all()
+
+    def has_permission(self, request):
+        # override it to restrict who may export
+        return True
+
+    def get_fields(self, queryset):
+        assert self.fields is not None, 'fields are required'
+
+        return list(self.fields)
+
+    def get_data(self, request):
+        # mirror the input of the pager
+        data = {}
+        sort_fields = self.pager_class._sort_fields
+        sort = [name for value in request.GET.getlist('sort') for name in value.split(',') if name]
+
+        if sort:
+            unknown = [name for name in sort if name not in sort_fields]
+
+            if unknown:
+                raise ValueError('invalid sort fields: %s' % ', '.join(unknown))
+
+            data['sort'] = [sort_fields[name] for name in sort]
+
+        for key in ('offset', 'size'):
+            if key in request.GET:
+                data[key] = int(request.GET[key])
+
+                if data[key] < 0:
+                    raise ValueError('%s must be positive' % key)
+
+        return data
+
+    def get_format(self, request):
+        export_format = request.GET.get('format', None)
+
+        if export_format is None:
+            # use the accept header instead
+            accept = request.META.get('HTTP_ACCEPT', '')
+            export_format = next(
+                (name for name, content_type in content_types.items() if content_type in accept),
+                self.default_format,
+            )
+
+        if export_format not in content_types:
+            raise ValueError('invalid format: %s' % export_format)
+
+        return export_format
+
+    def get_rows(self, data, queryset, fields):
+        meta = self.pager_class._meta
+        queryset = self.pager_class.sort_queryset(queryset, data.get('sort', None))
+        # the whole set unless a page is requested
+        offset = data.get('offset', 0)
+        size = data.get('size', None)
+
+        if meta.max_rows is not None:
+            # never go beyond the hard limit
+            size = meta.max_rows if size is None else min(size, meta.max_rows)
+
+        if offset or size is not None:
+            queryset = queryset[offset:None if size is None else offset + size]
+
+        # plain tuples read chunk by chunk (server side cursors where supported)
+        return queryset.values_list(*fields).iterator(chunk_size=meta.chunk_size)
+
+    def stream_ndjson(self, rows, fields):
+        for row in rows:
+            yield json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder) + '\n'
+
+    def stream_csv(self, rows, fields):
+        writer = csv.writer(Echo())
+        yield writer.writerow(fields)
+
+        for row in rows:
+            yield writer.writerow(row)
+
+    def get(self, request, *args, **kwargs):
+        if not self.has_permission(request):
+            return HttpResponseForbidden()
+
+        try:
+            data = self.get_data(request)
+            export_format = self.get_format(request)
+        except ValueError as error:
+            return HttpResponseBadRequest(str(error))
+
+        queryset = self.get_queryset(request)
+        fields = self.get_fields(queryset)
+        rows = self.get_rows(data, queryset, fields)
+
+        response = StreamingHttpResponse(
+            getattr(self, 'stream_%s' % export_format)(rows, fields),
+            content_type=content_types[export_format],
+        )
+
+        if self.filename:
+            # download it as a file
+            response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (self.filename, export_format)
+
+        return response
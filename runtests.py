@@ -0,0 +1,17 @@
+"""
+Run the test suite
+
+    python runtests.py [tests.test_module]
+"""
+import os
+import sys
+import django
+from django.conf import settings
+from django.test.utils import get_runner
+
+if __name__ == '__main__':
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.settings')
+    django.setup()
+    runner = get_runner(settings)()
+    failures = runner.run_tests(sys.argv[1:] or ['tests'])
+    sys.exit(bool(failures))
@@ -22,6 +22,6 @@ setup(
     ],
     keywords='django graphene utils',
     packages=['django_graphene_utils'],
-    install_requires=['django', 'graphene-django'],
+    install_requires=['django>=2.2,<3.0', 'graphene-django'],
     python_requires='>=3.5',
 )
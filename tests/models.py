@@ -0,0 +1,19 @@
+import datetime
+from django.db import models
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+
+
+class Book(models.Model):
+    title = models.CharField(max_length=50)
+    code = models.CharField(max_length=10, unique=True, null=True, blank=True)
+    price = models.IntegerField(default=0)
+    published = models.DateTimeField(default=datetime.datetime.now)
+    author = models.ForeignKey(Author, null=True, blank=True, on_delete=models.CASCADE, related_name='books')
+
+
+class Review(models.Model):
+    # books cannot be deleted while reviewed
+    book = models.ForeignKey(Book, on_delete=models.PROTECT, related_name='reviews')
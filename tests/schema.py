@@ -0,0 +1,102 @@
+import graphene
+from django import forms
+from graphene_django import DjangoObjectType
+from django_graphene_utils import ModelFormMutation, Pager, convert_form
+from .models import Author, Book
+
+"""
+Types, forms and mutations shared by the tests
+"""
+
+
+class AuthorType(DjangoObjectType):
+    class Meta:
+        model = Author
+
+
+class BookType(DjangoObjectType):
+    class Meta:
+        model = Book
+
+
+class BookForm(forms.ModelForm):
+    class Meta:
+        model = Book
+        fields = ['title', 'price', 'code', 'author']
+
+
+class ReplicaBookForm(BookForm):
+    def save(self, commit=True):
+        # must not be bypassed by mutations
+        self.instance.title = '%s (saved)' % self.instance.title
+
+        return super(ReplicaBookForm, self).save(commit)
+
+
+BookInput = convert_form(BookForm, name='BookInput', all_optional=True)
+
+
+# arguments received by the middleware of bulk mutations
+middleware_calls = []
+
+
+def record_middleware(next):
+    def execute(mutation, root, args, context, info):
+        middleware_calls.append(args)
+
+        return next(mutation, root, args, context, info)
+
+    return execute
+
+
+class CreateBook(ModelFormMutation):
+    class Input:
+        data = graphene.Argument(BookInput, required=True)
+
+    class Meta:
+        form = BookForm
+        output_instance_key = 'book'
+        batch_unique_checks = True
+        middlewares = [record_middleware]
+
+
+class CreateReplicaBook(ModelFormMutation):
+    class Input:
+        data = graphene.Argument(BookInput, required=True)
+
+    class Meta:
+        form = ReplicaBookForm
+        output_instance_key = 'book'
+        using = 'replica'
+
+
+class BookPager(Pager):
+    TITLE = 'title'
+    CODE = 'code'
+    PUBLISHED = 'published'
+
+    class Meta:
+        keyset = True
+
+
+class ReplicaBookPager(Pager):
+    TITLE = 'title'
+
+    class Meta:
+        using = 'replica'
+
+
+class Query(graphene.ObjectType):
+    books = graphene.List(BookType)
+
+    def resolve_books(self, args, context, info):
+        return ReplicaBookPager({'sort': ['title']}, Book.objects.all(), context=context).qs
+
+
+class Mutation(graphene.ObjectType):
+    create_book = CreateBook.as_mutation().Field()
+    create_books = CreateBook.as_bulk_mutation().Field()
+    create_replica_book = CreateReplicaBook.as_mutation().Field()
+
+
+schema = graphene.Schema(query=Query, mutation=Mutation)
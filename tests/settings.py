@@ -0,0 +1,16 @@
+"""
+Settings of the test project, two SQLite databases stand for a primary and its replica
+"""
+
+SECRET_KEY = 'django-graphene-utils-tests'
+
+INSTALLED_APPS = ['django.contrib.contenttypes', 'graphene_django', 'tests']
+
+DATABASES = {
+    'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'},
+    'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'},
+}
+
+CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+USE_TZ = False
@@ -0,0 +1,73 @@
+import graphene
+from django import forms
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django_graphene_utils import ModelFormMutation, ReduceMixin, ReduceMixinForm, convert_form
+from .models import Book
+from .schema import Query
+
+
+class BookForm(ReduceMixinForm, forms.ModelForm):
+    class Meta:
+        model = Book
+        fields = ['title', 'price']
+
+
+BookInput = convert_form(BookForm, name='BatchBookInput', all_optional=True)
+
+
+class UpdateBook(ReduceMixin, ModelFormMutation):
+    class Input:
+        id = graphene.ID(required=True)
+        data = graphene.Argument(BookInput, required=True)
+
+    class Meta:
+        form = BookForm
+        filter = {'pk': 'id'}
+        batch_lookups = True
+
+
+class Mutation(graphene.ObjectType):
+    update_book = UpdateBook.as_mutation().Field()
+
+
+schema = graphene.Schema(query=Query, mutation=Mutation)
+
+
+class BatchLookupTests(TestCase):
+    def setUp(self):
+        self.first = Book.objects.create(title='first', price=1)
+        self.second = Book.objects.create(title='second', price=2)
+
+    def execute(self, query):
+        with CaptureQueriesContext(connection) as queries:
+            result = schema.execute(query, context_value={})
+
+        self.assertIsNone(result.errors)
+
+        return result.data, [query['sql'] for query in queries if query['sql'].startswith('SELECT')]
+
+    def test_siblings_loaded_at_once(self):
+        data, selects = self.execute('''mutation {
+            a: updateBook(id: %d, data: {title: "a"}) { success }
+            b: updateBook(id: %d, data: {title: "b"}) { success }
+        }''' % (self.first.pk, self.second.pk))
+
+        self.assertTrue(data['a']['success'])
+        self.assertTrue(data['b']['success'])
+        # a single lookup for both mutations
+        self.assertEqual(len(selects), 1)
+        self.assertEqual(list(Book.objects.order_by('pk').values_list('title', flat=True)), ['a', 'b'])
+
+    def test_invalid_form_discards_instance(self):
+        data, selects = self.execute('''mutation {
+            a: updateBook(id: %d, data: {title: "", price: 5}) { success }
+            b: updateBook(id: %d, data: {title: "b"}) { success }
+        }''' % (self.first.pk, self.first.pk))
+
+        self.assertFalse(data['a']['success'])
+        self.assertTrue(data['b']['success'])
+        # the instance changed by the invalid form is fetched again
+        self.assertEqual(len(selects), 2)
+        self.assertEqual(Book.objects.values_list('title', 'price').get(pk=self.first.pk), ('b', 1))
@@ -0,0 +1,41 @@
+from django.test import TestCase
+from .models import Book
+from .schema import middleware_calls, schema
+
+create_books = '''
+mutation {
+    createBooks(data: [
+        {title: "first", price: 1, code: "a"},
+        {price: 2},
+        {title: "third", price: 3, code: "b"}
+    ]) {
+        success
+        results { success errors { key } book { title } }
+    }
+}
+'''
+
+
+class BulkMutationTests(TestCase):
+    def setUp(self):
+        del middleware_calls[:]
+
+    def test_results_per_item(self):
+        result = schema.execute(create_books, context_value={})
+
+        self.assertIsNone(result.errors)
+        data = result.data['createBooks']
+        self.assertFalse(data['success'])
+        self.assertEqual([item['success'] for item in data['results']], [True, False, True])
+        # the title is missing
+        self.assertEqual(data['results'][1]['errors'][0]['key'], 'title')
+        self.assertEqual(data['results'][0]['book']['title'], 'first')
+        # valid items are saved
+        self.assertEqual(sorted(Book.objects.values_list('title', flat=True)), ['first', 'third'])
+
+    def test_goes_through_middlewares(self):
+        schema.execute(create_books, context_value={})
+
+        # a single call for the whole batch
+        self.assertEqual(len(middleware_calls), 1)
+        self.assertEqual(len(middleware_calls[0]['data']), 3)
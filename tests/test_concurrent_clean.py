@@ -0,0 +1,82 @@
+import threading
+import graphene
+from django import forms
+from django.test import TestCase
+from django_graphene_utils import FormMutation, convert_form
+from django_graphene_utils.forms import ConcurrentCleanMixinForm
+from .schema import Query
+
+
+class RangeForm(forms.Form):
+    start = forms.IntegerField(min_value=0)
+    end = forms.IntegerField(min_value=0)
+    label = forms.CharField(max_length=3)
+
+    def __init__(self, *args, **kwargs):
+        super(RangeForm, self).__init__(*args, **kwargs)
+        self.clean_threads = []
+
+    def clean_end(self):
+        # the thread and the earlier value must be the ones of a plain form
+        self.clean_threads.append(threading.get_ident())
+        end = self.cleaned_data['end']
+
+        if 'start' in self.cleaned_data and end < self.cleaned_data['start']:
+            raise forms.ValidationError('Must follow the start.')
+
+        return end
+
+
+class ConcurrentRangeForm(ConcurrentCleanMixinForm, RangeForm):
+    cpu_bound_fields = ('label',)
+
+
+RangeInput = convert_form(RangeForm, name='RangeInput', all_optional=True)
+
+
+class CheckRange(FormMutation):
+    class Input:
+        data = graphene.Argument(RangeInput, required=True)
+
+    class Meta:
+        form = RangeForm
+        concurrent_clean = True
+
+
+class Mutation(graphene.ObjectType):
+    check_range = CheckRange.as_mutation().Field()
+
+
+schema = graphene.Schema(query=Query, mutation=Mutation)
+
+
+class ConcurrentCleanTests(TestCase):
+    def test_same_as_plain_form(self):
+        for data in [
+            {'start': 1, 'end': 2, 'label': 'abc'},
+            {'start': 2, 'end': 1, 'label': 'abc'},
+            {'start': -1, 'end': 'x', 'label': 'abcd'},
+        ]:
+            plain, concurrent = RangeForm(data), ConcurrentRangeForm(data)
+
+            self.assertEqual(concurrent.is_valid(), plain.is_valid())
+            self.assertEqual(concurrent.cleaned_data, plain.cleaned_data)
+            # errors come in field order
+            self.assertEqual(list(concurrent.errors.items()), list(plain.errors.items()))
+
+    def test_clean_methods_on_calling_thread(self):
+        form = ConcurrentRangeForm({'start': 2, 'end': 1, 'label': 'abc'})
+
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.clean_threads, [threading.get_ident()])
+        self.assertEqual(form.errors['end'], ['Must follow the start.'])
+
+    def test_mutation(self):
+        self.assertTrue(issubclass(CheckRange._meta.form_class, ConcurrentCleanMixinForm))
+
+        result = schema.execute('mutation { checkRange(data: {start: 2, end: 1, label: "abcd"}) '
+                                '{ success errors { key } } }')
+
+        self.assertIsNone(result.errors)
+        self.assertFalse(result.data['checkRange']['success'])
+        self.assertEqual([error['key'] for error in result.data['checkRange']['errors']], ['end', 'label'])
@@ -0,0 +1,53 @@
+from django.test import TestCase
+from django_graphene_utils import Pager
+from .models import Author, Book
+
+
+class AuthorPager(Pager):
+    NAME = 'name'
+
+    class Meta:
+        count = 'exact'
+
+
+class CappedBookPager(Pager):
+    TITLE = 'title'
+
+    class Meta:
+        count = 'capped'
+        count_cap = 3
+
+
+class CountTests(TestCase):
+    def setUp(self):
+        for index in range(3):
+            author = Author.objects.create(name='author %d' % index)
+
+            for title in ('x1', 'x2', 'x3' if index == 0 else 'y'):
+                Book.objects.create(title='%s %d' % (title, index), author=author)
+
+    def test_folded_into_the_page(self):
+        pager = AuthorPager({'size': 2}, Author.objects.all())
+
+        with self.assertNumQueries(1):
+            self.assertEqual(len(list(pager.qs)), 2)
+            self.assertEqual(pager.total_count, 3)
+
+    def test_distinct_is_counted_on_its_own(self):
+        # three books of the same author match
+        queryset = Author.objects.filter(books__title__startswith='x', name='author 0').distinct()
+        pager = AuthorPager({'size': 2}, queryset)
+
+        self.assertEqual(len(list(pager.qs)), 1)
+        self.assertEqual(pager.total_count, 1)
+
+    def test_capped(self):
+        pager = CappedBookPager({'size': 2}, Book.objects.all())
+
+        self.assertEqual(pager.total_count, 3)
+        self.assertFalse(pager.total_count_is_exact)
+
+        pager = CappedBookPager({'size': 2}, Book.objects.filter(title__startswith='x1'))
+
+        self.assertEqual(pager.total_count, 3)
+        self.assertTrue(pager.total_count_is_exact)
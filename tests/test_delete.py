@@ -0,0 +1,93 @@
+import graphene
+from django.test import TestCase
+from django_graphene_utils import DeleteMutation
+from .models import Author, Book, Review
+from .schema import Query
+
+
+class DeleteBook(DeleteMutation):
+    class Input:
+        id = graphene.ID(required=True)
+
+    class Meta:
+        model = Book
+        filter = {'pk': 'id'}
+
+
+class DeleteBooks(DeleteMutation):
+    class Input:
+        ids = graphene.List(graphene.ID, required=True)
+
+    class Meta:
+        queryset = Book.objects.filter(price__gt=0)
+        filter = {'pk': 'ids'}
+
+
+class DeleteAuthor(DeleteMutation):
+    class Input:
+        id = graphene.ID(required=True)
+
+    class Meta:
+        model = Author
+        filter = {'pk': 'id'}
+
+
+class Mutation(graphene.ObjectType):
+    delete_author = DeleteAuthor.as_mutation().Field()
+    delete_book = DeleteBook.as_mutation().Field()
+    delete_books = DeleteBooks.as_mutation().Field()
+
+
+schema = graphene.Schema(query=Query, mutation=Mutation)
+
+
+class DeleteMutationTests(TestCase):
+    def setUp(self):
+        self.books = [Book.objects.create(title=title, price=price) for title, price in [('a', 1), ('b', 0), ('c', 1)]]
+
+    def execute(self, query):
+        result = schema.execute(query, context_value={})
+        self.assertIsNone(result.errors)
+
+        return result.data
+
+    def test_delete(self):
+        data = self.execute('mutation { deleteBook(id: %d) { success count } }' % self.books[0].pk)
+
+        self.assertEqual(data['deleteBook'], {'success': True, 'count': 1})
+        self.assertFalse(Book.objects.filter(pk=self.books[0].pk).exists())
+
+        # already gone
+        data = self.execute('mutation { deleteBook(id: %d) { success count } }' % self.books[0].pk)
+        self.assertEqual(data['deleteBook'], {'success': True, 'count': 0})
+
+    def test_delete_many(self):
+        data = self.execute('mutation { deleteBooks(ids: [%s]) { success count } }' % ', '.join(
+            str(book.pk) for book in self.books
+        ))
+
+        # rows out of the queryset are kept
+        self.assertEqual(data['deleteBooks'], {'success': True, 'count': 2})
+        self.assertEqual(list(Book.objects.values_list('title', flat=True)), ['b'])
+
+    def test_cascade(self):
+        author = Author.objects.create(name='author')
+        Book.objects.filter(pk__in=[self.books[0].pk, self.books[1].pk]).update(author=author)
+        data = self.execute('mutation { deleteAuthor(id: %d) { success count } }' % author.pk)
+
+        # cascaded rows are not counted
+        self.assertEqual(data['deleteAuthor'], {'success': True, 'count': 1})
+        self.assertEqual(list(Book.objects.values_list('title', flat=True)), ['c'])
+
+    def test_protected(self):
+        Review.objects.create(book=self.books[2])
+        data = self.execute('mutation { deleteBooks(ids: [%d, %d]) { success count errors { key message } } }' % (
+            self.books[0].pk, self.books[2].pk,
+        ))
+
+        self.assertFalse(data['deleteBooks']['success'])
+        self.assertEqual(data['deleteBooks']['count'], 0)
+        self.assertEqual(data['deleteBooks']['errors'][0]['key'], '__all__')
+        self.assertIn('protected foreign key', data['deleteBooks']['errors'][0]['message'])
+        # nothing has been deleted
+        self.assertEqual(Book.objects.count(), 3)
@@ -0,0 +1,76 @@
+import json
+from django.test import RequestFactory, TestCase
+from django_graphene_utils import Pager, PagerExportView
+from .models import Book
+
+
+class ExportBookPager(Pager):
+    TITLE = 'title'
+    PRICE = 'price'
+
+    class Meta:
+        max_rows = 2
+
+
+class BookExportView(PagerExportView):
+    pager_class = ExportBookPager
+    queryset = Book.objects.all()
+    fields = ['title', 'price']
+    filename = 'books'
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+        for title, price in [('b', 2), ('a', 3), ('c', 1)]:
+            Book.objects.create(title=title, price=price, code=title)
+
+    def export(self, view_class=BookExportView, **kwargs):
+        return view_class.as_view()(self.factory.get('/export', **kwargs))
+
+    def get_content(self, response):
+        self.assertEqual(response.status_code, 200)
+
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        response = self.export(data={'sort': 'title'})
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="books.ndjson"')
+        # capped by the pager
+        self.assertEqual([json.loads(line) for line in self.get_content(response).splitlines()], [
+            {'title': 'a', 'price': 3},
+            {'title': 'b', 'price': 2},
+        ])
+
+    def test_csv(self):
+        response = self.export(data={'sort': 'price_Desc'}, HTTP_ACCEPT='text/csv')
+
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(self.get_content(response).splitlines(), ['title,price', 'a,3', 'b,2'])
+
+    def test_page(self):
+        response = self.export(data={'sort': 'title', 'offset': '1', 'size': '5', 'format': 'csv'})
+
+        self.assertEqual(self.get_content(response).splitlines(), ['title,price', 'b,2', 'c,1'])
+
+    def test_invalid_input(self):
+        self.assertEqual(self.export(data={'sort': 'code'}).status_code, 400)
+        self.assertEqual(self.export(data={'size': '-1'}).status_code, 400)
+        self.assertEqual(self.export(data={'format': 'xml'}).status_code, 400)
+
+    def test_permission(self):
+        class ForbiddenExportView(BookExportView):
+            def has_permission(self, request):
+                return False
+
+        self.assertEqual(self.export(ForbiddenExportView).status_code, 403)
+
+    def test_fields_required(self):
+        class NoFieldsExportView(BookExportView):
+            fields = None
+
+        with self.assertRaises(AssertionError):
+            self.export(NoFieldsExportView)
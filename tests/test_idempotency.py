@@ -0,0 +1,90 @@
+import graphene
+from django.core.cache import cache
+from django.test import TestCase
+from django_graphene_utils import ModelFormMutation
+from .models import Book
+from .schema import BookForm, BookInput, Query
+
+
+class CreateBook(ModelFormMutation):
+    class Input:
+        data = graphene.Argument(BookInput, required=True)
+
+    class Meta:
+        form = BookForm
+        idempotency = True
+        idempotency_wait = 0.1
+        idempotency_poll = 0.01
+
+
+class Mutation(graphene.ObjectType):
+    create_book = CreateBook.as_mutation().Field()
+
+
+schema = graphene.Schema(query=Query, mutation=Mutation)
+
+
+class User(object):
+    def __init__(self, pk=None):
+        self.pk = pk
+        self.is_authenticated = pk is not None
+
+
+class Context(object):
+    session = None
+
+    def __init__(self, user):
+        self.user = user
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def create(self, key, user=None, title='title'):
+        result = schema.execute(
+            'mutation { createBook(idempotencyKey: "%s", data: {title: "%s", price: 1}) '
+            '{ success errors { key message } } }' % (key, title),
+            context_value=Context(user or User()),
+        )
+        self.assertIsNone(result.errors)
+
+        return result.data['createBook']
+
+    def test_replay(self):
+        response = self.create('a')
+        self.assertTrue(response['success'])
+        # the retry gets the first response without running again
+        self.assertEqual(self.create('a'), response)
+        self.assertEqual(Book.objects.count(), 1)
+
+        # the same key with another input is another request
+        self.create('a', title='other')
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_scope(self):
+        self.create('a', user=User(1))
+        self.create('a', user=User(1))
+        self.assertEqual(Book.objects.count(), 1)
+
+        # keys of another user never collide
+        self.create('a', user=User(2))
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_lock(self):
+        key = CreateBook().get_idempotency_key(
+            None, {'idempotency_key': 'a', 'data': {'title': 'title', 'price': 1}}, Context(User()), None,
+        )
+        # another request with the same key is running
+        cache.set('%s:lock' % key, True)
+
+        response = self.create('a')
+
+        self.assertFalse(response['success'])
+        self.assertEqual(response['errors'][0]['message'], 'A request with the same idempotency key is still running.')
+        self.assertEqual(Book.objects.count(), 0)
+
+        # it may run once the lock is released
+        cache.delete('%s:lock' % key)
+        self.assertTrue(self.create('a')['success'])
+        self.assertEqual(Book.objects.count(), 1)
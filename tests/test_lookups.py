@@ -0,0 +1,49 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django_graphene_utils import get_objects_or_none
+from django_graphene_utils.utils import get_objects_for_filters
+from .models import Author, Book
+
+
+class BatchedLookupTests(TestCase):
+    def setUp(self):
+        self.authors = [Author.objects.create(name='author %d' % index) for index in range(2)]
+        self.books = [
+            Book.objects.create(title='book %d' % index, code='c%d' % index, author=self.authors[index % 2])
+            for index in range(6)
+        ]
+
+    def test_objects_or_none(self):
+        books = get_objects_or_none(Book, [self.books[2].pk, 'invalid', 0, str(self.books[0].pk)])
+
+        self.assertEqual(books, [self.books[2], None, None, self.books[0]])
+
+    def test_chunks(self):
+        with CaptureQueriesContext(connection) as queries:
+            books = get_objects_or_none(Book, [book.code for book in self.books], field_name='code', batch_size=4)
+
+        self.assertEqual(books, self.books)
+        self.assertEqual(len(queries), 2)
+
+    def test_filters_on_relations(self):
+        queryset = Book.objects.all()
+        filters = [
+            {'title': 'book 1', 'author': self.authors[1]},
+            {'title': 'book 2', 'author': self.authors[1].pk},
+            {'title': 'book 4', 'author__name': 'author 0'},
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            books = get_objects_for_filters(queryset, filters, batch_size=2)
+
+        self.assertEqual(books, [self.books[1], None, self.books[4]])
+        # a query per chunk, related rows are never loaded to match them
+        self.assertEqual(len(queries), 3)
+
+    def test_request_identity_map(self):
+        context = {}
+        get_objects_or_none(Book, [self.books[0].pk], context=context)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_objects_or_none(Book, [self.books[0].pk], context=context), [self.books[0]])
@@ -0,0 +1,85 @@
+import graphene
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django_graphene_utils import ModelFormMutation
+from .models import Author, Book
+from .schema import BookForm, BookInput, Query
+
+
+class CreateBook(ModelFormMutation):
+    class Input:
+        data = graphene.Argument(BookInput, required=True)
+
+    class Meta:
+        form = BookForm
+        output_instance_key = 'book'
+        optimize_output = True
+
+
+class UpdateBook(CreateBook):
+    class Input:
+        id = graphene.ID(required=True)
+        data = graphene.Argument(BookInput, required=True)
+
+    class Meta:
+        form = BookForm
+        filter = {'pk': 'id'}
+        output_instance_key = 'book'
+        optimize_output = True
+
+
+class Mutation(graphene.ObjectType):
+    create_book = CreateBook.as_mutation().Field()
+    update_books = UpdateBook.as_bulk_mutation().Field()
+
+
+schema = graphene.Schema(query=Query, mutation=Mutation)
+
+
+class OptimizeOutputTests(TestCase):
+    def setUp(self):
+        self.authors = [Author.objects.create(name=name) for name in 'abc']
+
+        for author in self.authors:
+            Book.objects.create(title='old', author=author)
+
+    def execute(self, query):
+        with CaptureQueriesContext(connection) as queries:
+            result = schema.execute(query, context_value={})
+
+        self.assertIsNone(result.errors)
+        # lookups of the books of each author
+        selects = [query['sql'] for query in queries if query['sql'].startswith('SELECT "tests_book"')]
+
+        return result.data, selects
+
+    def test_single(self):
+        data, selects = self.execute('''mutation {
+            createBook(data: {title: "new", price: 1, author: "%d"}) {
+                book { author { name books { title } } }
+            }
+        }''' % self.authors[0].pk)
+
+        author = data['createBook']['book']['author']
+        self.assertEqual(author['name'], 'a')
+        self.assertEqual(sorted(book['title'] for book in author['books']), ['new', 'old'])
+        self.assertEqual(len(selects), 1)
+
+    def test_bulk(self):
+        # sqlite doesn't return primary keys of bulk inserts, update existing rows
+        books = list(Book.objects.order_by('pk'))
+        data, selects = self.execute('''mutation {
+            updateBooks(id: [%s], data: [%s]) {
+                results { book { author { name books { title } } } }
+            }
+        }''' % (
+            ', '.join(str(book.pk) for book in books),
+            ', '.join('{title: "new", price: 1, author: "%d"}' % book.author_id for book in books),
+        ))
+
+        results = data['updateBooks']['results']
+        self.assertEqual([result['book']['author']['name'] for result in results], ['a', 'b', 'c'])
+        self.assertEqual([result['book']['author']['books'] for result in results], [[{'title': 'new'}]] * 3)
+        # the instances to update then the books of every author at once
+        self.assertEqual(len(selects), 2)
@@ -0,0 +1,69 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django_graphene_utils import Pager
+from django_graphene_utils.caching import get_page_cache_stats, invalidate_model, reset_page_cache_stats
+from .models import Book
+from .schema import schema
+
+
+class CachedBookPager(Pager):
+    TITLE = 'title'
+
+    class Meta:
+        model = Book
+        cache = 'default'
+
+
+class PageCacheTests(TestCase):
+    def setUp(self):
+        Book.objects.create(title='a')
+        cache.clear()
+        reset_page_cache_stats()
+
+    def get_titles(self):
+        return [book.title for book in CachedBookPager({'sort': ['title']}, Book.objects.all(), context={}).qs]
+
+    def assertStats(self, hits, misses):
+        stats = get_page_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (hits, misses))
+
+    def test_hits(self):
+        self.assertEqual(self.get_titles(), ['a'])
+        self.assertStats(0, 1)
+
+        with self.assertNumQueries(1):
+            # primary keys come from the cache, rows from the database
+            self.assertEqual(self.get_titles(), ['a'])
+
+        self.assertStats(1, 1)
+
+    def test_save_invalidates(self):
+        self.get_titles()
+        result = schema.execute('mutation { createBook(data: {title: "b", price: 1}) { success } }', context_value={})
+
+        self.assertTrue(result.data['createBook']['success'])
+        self.assertEqual(self.get_titles(), ['a', 'b'])
+        self.assertStats(0, 2)
+
+    def test_bulk_save_invalidates(self):
+        self.get_titles()
+        result = schema.execute(
+            'mutation { createBooks(data: [{title: "b", price: 1}, {title: "c", price: 1}]) { success } }',
+            context_value={},
+        )
+
+        self.assertTrue(result.data['createBooks']['success'])
+        # bulk inserts send no signals
+        self.assertEqual(self.get_titles(), ['a', 'b', 'c'])
+        self.assertStats(0, 2)
+
+    def test_invalidate_model(self):
+        self.get_titles()
+        Book.objects.bulk_create([Book(title='b')])
+
+        # bulk inserts are not signaled
+        self.assertEqual(self.get_titles(), ['a'])
+
+        invalidate_model(Book)
+        self.assertEqual(self.get_titles(), ['a', 'b'])
+        self.assertEqual(get_page_cache_stats()['invalidations'], 1)
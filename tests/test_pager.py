@@ -0,0 +1,58 @@
+import datetime
+from django.test import TestCase
+from .models import Book
+from .schema import BookPager
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        published = datetime.datetime(2020, 1, 1, 12, 0, 0, 1)
+
+        # values only differ by microseconds, and some share the same date
+        for index in range(7):
+            Book.objects.create(
+                title='book %d' % index,
+                published=published + datetime.timedelta(microseconds=index // 2),
+            )
+
+    def get_page(self, **data):
+        data.setdefault('size', 3)
+
+        return BookPager(data, Book.objects.all())
+
+    def test_walk_forward(self):
+        titles = []
+        page = self.get_page(sort=['published'])
+
+        while list(page.qs):
+            titles.extend(book.title for book in page.qs)
+            page = self.get_page(sort=['published'], after=page.end_cursor)
+
+        self.assertEqual(titles, ['book %d' % index for index in range(7)])
+
+    def test_walk_backward(self):
+        last = self.get_page(sort=['-published'], size=1)
+        titles = []
+        page = self.get_page(sort=['published'], before=last.start_cursor)
+
+        while list(page.qs):
+            titles = [book.title for book in page.qs] + titles
+            page = self.get_page(sort=['published'], before=page.start_cursor)
+
+        self.assertEqual(titles, ['book %d' % index for index in range(6)])
+
+    def test_nullable_ordering_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.get_page(sort=['code'])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            self.get_page(sort=['published'], after='not a cursor')
+
+    def test_input_exposes_cursors(self):
+        input_type = BookPager.to_input('BookPagerInput')
+        fields = input_type._meta.fields
+
+        self.assertIn('after', fields)
+        self.assertIn('before', fields)
+        self.assertEqual(fields['sort'].type.of_type._meta.name, 'BookPagerInputSortField')
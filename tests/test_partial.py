@@ -0,0 +1,106 @@
+import graphene
+from django import forms
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django_graphene_utils import ModelFormMutation, ReduceMixin, ReduceMixinForm, convert_form
+from .models import Book
+
+
+class BookForm(ReduceMixinForm, forms.ModelForm):
+    class Meta:
+        model = Book
+        fields = ['title', 'price', 'code']
+
+    def clean(self):
+        cleaned_data = super(BookForm, self).clean()
+
+        if 'price' in cleaned_data:
+            # set outside of the pushed fields
+            self.instance.code = 'p%d' % cleaned_data['price']
+
+        return cleaned_data
+
+
+class SavingBookForm(BookForm):
+    def save(self, commit=True):
+        self.instance.title = 'saved'
+
+        return super(SavingBookForm, self).save(commit)
+
+
+BookInput = convert_form(BookForm, name='PartialBookInput', all_optional=True)
+
+
+class PatchBook(ReduceMixin, ModelFormMutation):
+    class Input:
+        id = graphene.ID(required=True)
+        data = graphene.Argument(BookInput, required=True)
+
+    class Meta:
+        form = BookForm
+        filter = {'pk': 'id'}
+        partial_updates = True
+
+
+class PatchSavingBook(PatchBook):
+    class Input:
+        id = graphene.ID(required=True)
+        data = graphene.Argument(BookInput, required=True)
+
+    class Meta:
+        form = SavingBookForm
+        filter = {'pk': 'id'}
+        partial_updates = True
+
+
+class Mutation(graphene.ObjectType):
+    patch_book = PatchBook.as_mutation().Field()
+    patch_saving_book = PatchSavingBook.as_mutation().Field()
+
+
+schema = graphene.Schema(query=Mutation, mutation=Mutation)
+
+
+class PartialUpdateTests(TestCase):
+    def setUp(self):
+        self.book = Book.objects.create(title='title', price=1, code='p1')
+        self.saves = []
+        post_save.connect(self.on_save, sender=Book)
+
+    def tearDown(self):
+        post_save.disconnect(self.on_save, sender=Book)
+
+    def on_save(self, sender, update_fields, **kwargs):
+        self.saves.append(update_fields)
+
+    def patch(self, data, mutation='patchBook'):
+        with CaptureQueriesContext(connection) as queries:
+            result = schema.execute('mutation { %s(id: %d, data: {%s}) { success } }' % (mutation, self.book.pk, data))
+
+        self.assertIsNone(result.errors)
+        self.assertTrue(result.data[mutation]['success'])
+
+        return [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+
+    def test_changed_columns_only(self):
+        updates = self.patch('price: 2')
+
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"title"', updates[0])
+        # columns changed by clean methods are written as well
+        self.assertEqual(self.saves, [frozenset(['price', 'code'])])
+        self.assertEqual(Book.objects.values_list('price', 'code').get(), (2, 'p2'))
+
+    def test_nothing_changed(self):
+        self.assertEqual(self.patch('price: 1'), [])
+        # like django with empty update_fields
+        self.assertEqual(self.saves, [])
+
+    def test_form_saving_itself(self):
+        updates = self.patch('price: 2', 'patchSavingBook')
+
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.saves, [None])
+        self.assertEqual(Book.objects.values_list('title', 'price').get(), ('saved', 2))
@@ -0,0 +1,51 @@
+from django import forms
+from django.test import TestCase
+from django_graphene_utils import ReduceMixinForm
+from .models import Author, Book
+
+
+class BaseBookForm(forms.ModelForm):
+    class Meta:
+        model = Book
+        fields = ['title', 'price', 'code', 'author']
+
+    def __init__(self, *args, **kwargs):
+        super(BaseBookForm, self).__init__(*args, **kwargs)
+        # the usual django pattern, whatever the pushed fields are
+        self.fields['author'].queryset = Author.objects.filter(name='writer')
+
+
+class BookForm(ReduceMixinForm, BaseBookForm):
+    pass
+
+
+class CachedBookForm(ReduceMixinForm, forms.ModelForm):
+    cache_reduced_classes = True
+
+    class Meta:
+        model = Book
+        fields = ['title', 'price', 'code', 'author']
+
+
+class ReduceTests(TestCase):
+    def test_reduced_fields(self):
+        form = BookForm(data={'title': 'x'}, reduce_to=['title'])
+
+        self.assertEqual(list(form.fields), ['title'])
+        self.assertEqual(list(form.original_fields), ['title', 'price', 'code', 'author'])
+        # customizations of the constructor are kept
+        queryset = form.original_fields['author'].queryset
+        self.assertEqual(str(queryset.query), str(Author.objects.filter(name='writer').query))
+
+    def test_cached_classes(self):
+        CachedBookForm.reduced_cache_clear()
+
+        for names in (['title'], ['price', 'title'], ['title']):
+            form = CachedBookForm(data={'title': 'x', 'price': 1}, reduce_to=names)
+            self.assertTrue(form.is_valid())
+            self.assertEqual(list(form.fields), names)
+
+        # only the pushed fields are declared (and copied)
+        self.assertEqual(list(type(form).base_fields), ['title'])
+        self.assertEqual(CachedBookForm.reduced_cache_info()[:2], (1, 2))
+        self.assertEqual(list(form.original_fields), ['title', 'price', 'code', 'author'])
@@ -0,0 +1,87 @@
+from django.core.cache import cache
+from django.test import TestCase
+from .models import Author, Book
+from django_graphene_utils import Pager
+from django_graphene_utils.routing import stick_to_database
+from .schema import ReplicaBookPager, schema
+
+
+class ReplicaAuthorPager(Pager):
+    NAME = 'name'
+
+    class Meta:
+        using = 'replica'
+
+
+class CachedReplicaBookPager(Pager):
+    TITLE = 'title'
+
+    class Meta:
+        model = Book
+        cache = 'default'
+        using = 'replica'
+
+
+create_book = 'mutation { createBook(data: {title: "%s", price: 1}) { success book { id } } }'
+
+
+class RoutingTests(TestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        # the replica lags behind the primary
+        Book.objects.using('replica').create(title='replicated')
+
+    def get_titles(self, context):
+        return [book.title for book in ReplicaBookPager({'sort': ['title']}, Book.objects.all(), context=context).qs]
+
+    def test_pager_reads_replica(self):
+        Book.objects.create(title='primary only')
+
+        self.assertEqual(self.get_titles({}), ['replicated'])
+
+    def test_reads_stick_to_primary_after_write(self):
+        context = {}
+        result = schema.execute(create_book % 'written', context_value=context)
+
+        self.assertIsNone(result.errors)
+        self.assertTrue(result.data['createBook']['success'])
+        # the request sees its own write
+        self.assertEqual(self.get_titles(context), ['written'])
+        # other requests still read the replica
+        self.assertEqual(self.get_titles({}), ['replicated'])
+
+    def test_create_follows_using_policy(self):
+        result = schema.execute('mutation { createReplicaBook(data: {title: "routed", price: 1}) { success } }')
+
+        self.assertIsNone(result.errors)
+        self.assertTrue(result.data['createReplicaBook']['success'])
+        # written on the replica through the save method of the form
+        self.assertTrue(Book.objects.using('replica').filter(title='routed (saved)').exists())
+        self.assertFalse(Book.objects.filter(title__startswith='routed').exists())
+
+    def test_stickiness_is_per_model(self):
+        context = {}
+        Author.objects.create(name='primary only')
+        schema.execute(create_book % 'written', context_value=context)
+
+        # authors have not been written by this request
+        authors = ReplicaAuthorPager({}, Author.objects.all(), context=context).qs
+        self.assertEqual(list(authors), [])
+
+    def test_cached_pages_are_per_database(self):
+        cache.clear()
+        # not signaled, pages of the primary are not invalidated
+        Book.objects.bulk_create([Book(title='a'), Book(title='b')])
+
+        def get_titles(context):
+            pager = CachedReplicaBookPager({'sort': ['title']}, Book.objects.all(), context=context)
+
+            return [book.title for book in pager.qs]
+
+        self.assertEqual(get_titles({}), ['replicated'])
+
+        context = {}
+        stick_to_database(context, Book, 'default')
+        # the page of the replica is not served for the primary
+        self.assertEqual(get_titles(context), ['a', 'b'])
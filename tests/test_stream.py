@@ -0,0 +1,41 @@
+import graphene
+from django.test import TestCase
+from django_graphene_utils import Pager
+from .models import Book
+from .schema import BookType
+
+
+class StreamedBookPager(Pager):
+    TITLE = 'title'
+
+    class Meta:
+        stream = True
+        chunk_size = 2
+
+
+class Query(graphene.ObjectType):
+    books = graphene.List(BookType)
+
+    def resolve_books(self, args, context, info):
+        return StreamedBookPager({'all': True, 'sort': ['title']}, Book.objects.all()).qs
+
+
+schema = graphene.Schema(query=Query)
+
+
+class StreamTests(TestCase):
+    def setUp(self):
+        for index in range(5):
+            Book.objects.create(title='book %d' % index)
+
+    def test_through_graphql(self):
+        result = schema.execute('{ books { title } }')
+
+        self.assertIsNone(result.errors)
+        self.assertEqual([book['title'] for book in result.data['books']], ['book %d' % index for index in range(5)])
+
+    def test_iterable_more_than_once(self):
+        items = StreamedBookPager({'all': True}, Book.objects.all()).qs
+
+        self.assertEqual(len(list(items)), 5)
+        self.assertEqual(len(list(items)), 5)
@@ -0,0 +1,36 @@
+from django.test import TestCase
+from .models import Book
+from .schema import schema
+
+create_books = '''
+mutation {
+    createBooks(data: [
+        {title: "first", price: 1, code: "a"},
+        {title: "second", price: 2, code: "b"},
+        {title: "third", price: 3, code: "b"}
+    ]) {
+        success
+        results { success errors { key } }
+    }
+}
+'''
+
+
+class BatchUniqueTests(TestCase):
+    def get_errors(self):
+        with self.assertNumQueries(4):
+            # a single uniqueness query for the batch, then the insert in a savepoint
+            result = schema.execute(create_books, context_value={})
+
+        self.assertIsNone(result.errors)
+
+        return [[error['key'] for error in item['errors'] or []] for item in result.data['createBooks']['results']]
+
+    def test_duplicates_within_batch(self):
+        self.assertEqual(self.get_errors(), [[], [], ['code']])
+        self.assertEqual(sorted(Book.objects.values_list('title', flat=True)), ['first', 'second'])
+
+    def test_conflicts_with_existing_rows(self):
+        Book.objects.create(title='existing', code='a')
+
+        self.assertEqual(self.get_errors(), [['code'], [], ['code']])